@@ -2,9 +2,87 @@
 '''
     处理化学方程式化学式等的模块.
 '''
+from functools import wraps
 import re
 
 
+# Compiled patterns shared by all parsing.
+STATES_REGEX = re.compile(r'([^\<\>]*)(?:\<?\-\>)' +
+                          r'(?:([^\<\>]*)(?:\<?\-\>))?([^\<\>]*)')
+FORMULA_REGEX = re.compile(r'(\d*)([\w\*]*)_(\d*)([a-z\*]+)')
+SP_REGEX = re.compile(r'([a-zA-Z\*])(\d*)')
+
+# Caches of memoized functions.
+_caches = []
+
+
+def memoize(func):
+    """
+    Decorator to cache results of a function with hashable arguments,
+    exceptions are not cached.
+    """
+    cache = {}
+    _caches.append(cache)
+
+    @wraps(func)
+    def wrapper(*args):
+        try:
+            return cache[args]
+        except KeyError:
+            result = cache[args] = func(*args)
+            return result
+
+    wrapper.cache = cache
+    return wrapper
+
+
+def clear_caches():
+    "Clear all cached parsing results."
+    for cache in _caches:
+        cache.clear()
+
+
+@memoize
+def parse_states(rxn_equation):
+    "Split reaction equation string to a tuple of state strings."
+    m = STATES_REGEX.search(rxn_equation)
+    return tuple(m.group(idx).strip() for idx in range(1, 4) if m.group(idx))
+
+
+@memoize
+def parse_formula(formula):
+    "Split formula to stoichiometry, species name, site number, site name."
+    m = FORMULA_REGEX.search(formula)
+    if not m:
+        raise ChemFormulaError('Unexpected chemical formula: %s' % formula)
+    else:
+        stoich = int(m.group(1)) if m.group(1) else 1
+        species = m.group(2)
+        site = m.group(4)
+        nsite = int(m.group(3)) if m.group(3) else 1
+        return stoich, species, nsite, site
+
+
+@memoize
+def formula_texen(formula):
+    "Get tex string of a chemical formula."
+    return ChemFormula(formula).texen()
+
+
+@memoize
+def rxn_texen(rxn_equation):
+    "Get tex string of a reaction equation."
+    tex_list = [ChemState(state).texen() for state in parse_states(rxn_equation)]
+
+    if len(tex_list) == 3:
+        tex_str = tex_list[0] + r' \leftrightarrow ' + tex_list[1] + \
+                  r' \rightarrow ' + tex_list[-1]
+    elif len(tex_list) == 2:
+        tex_str = tex_list[0] + r' \rightarrow ' + tex_list[-1]
+
+    return tex_str
+
+
 class RxnEquation(object):
     """
     Class to create reaction equation object.
@@ -20,28 +98,10 @@ class RxnEquation(object):
 
     def tolist(self):
         "Convert rxn_equation string to rxn_list(chem_state objects)."
-        states_regex = re.compile(r'([^\<\>]*)(?:\<?\-\>)' +
-                                  r'(?:([^\<\>]*)(?:\<?\-\>))?([^\<\>]*)')
-        m = states_regex.search(self.rxn_equation)
-        state_list = []
-        for idx in range(1, 4):
-            if m.group(idx):
-                chem_state_obj = ChemState(m.group(idx).strip())
-                state_list.append(chem_state_obj)
-
-        return state_list
+        return [ChemState(state) for state in parse_states(self.rxn_equation)]
 
     def texen(self):
-        state_list = self.tolist()
-        tex_list = [state_obj.texen() for state_obj in state_list]
-
-        if len(tex_list) == 3:
-            tex_str = tex_list[0] + r' \leftrightarrow ' + tex_list[1] + \
-                      r' \rightarrow ' + tex_list[-1]
-        elif len(tex_list) == 2:
-            tex_str = tex_list[0] + r' \rightarrow ' + tex_list[-1]
-
-        return tex_str
+        return rxn_texen(self.rxn_equation)
 
 
 class ChemState(object):
@@ -54,12 +114,7 @@ class ChemState(object):
 
     def texen(self):
         "Get tex string."
-        first_sp = ChemFormula(self.sp_list[0])
-        tex_str = first_sp.texen()
-        for sp in self.sp_list[1:]:
-            tex_str += r' + ' + ChemFormula(sp).texen()
-
-        return tex_str
+        return r' + '.join(formula_texen(sp) for sp in self.sp_list)
 
     def __repr__(self):
         return self.chem_state
@@ -79,8 +134,8 @@ class ChemFormula(object):
     """
     def __init__(self, formula):
         self.formula = formula
-        self.formula_regex = re.compile(r'(\d*)([\w\*]*)_(\d*)([a-z\*]+)')
-        self.sp_regex = re.compile(r'([a-zA-Z\*])(\d*)')
+        self.formula_regex = FORMULA_REGEX
+        self.sp_regex = SP_REGEX
 
         self.stoich, self.species, self.nsite, self.site =\
             self.split()
@@ -96,16 +151,7 @@ class ChemFormula(object):
         Split whole formual to
         stoichiometry, species name, site number, site name.
         """
-        m = self.formula_regex.search(self.formula)
-        if not m:
-            raise ChemFormulaError('Unexpected chemical formula: %s' %
-                                   self.formula)
-        else:
-            stoich = int(m.group(1)) if m.group(1) else 1
-            species = m.group(2)
-            site = m.group(4)
-            nsite = int(m.group(3)) if m.group(3) else 1
-            return stoich, species, nsite, site
+        return parse_formula(self.formula)
 
     def split_species(self):
         return self.sp_regex.findall(self.species)
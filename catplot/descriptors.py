@@ -9,6 +9,19 @@ import numpy as np
 from catplot.chem_parser import RxnEquation
 
 
+def _check_template(template, interp_method, sampling, energies):
+    """ Check if barrier templates can be used for interpolation settings.
+    """
+    if not template:
+        return
+
+    if sampling != "uniform":
+        raise ValueError("barrier templates only support uniform sampling")
+
+    if interp_method == "quadratic" and energies is not None and len(energies) == 3:
+        raise ValueError("barrier templates are not available for quadratic barriers")
+
+
 class DescriptorBase(object):
     """ Abstract base class for other descriptor class.
     """
@@ -37,6 +50,13 @@ class ElementaryEnergies(DescriptorBase):
     def __init__(self, name):
         super(ElementaryEnergies, self).__init__(name)
 
+    def __set__(self, instance, value):
+        """ Keep energies in an immutable tuple, so the interpolated points
+        can only be changed by setting new energies.
+        """
+        value = tuple(float(e) for e in value)
+        super(ElementaryEnergies, self).__set__(instance, value)
+
     def _check(self, instance, value):
         """ Check elementary energies validity.
         """
@@ -45,6 +65,11 @@ class ElementaryEnergies(DescriptorBase):
             if e_ts <= max(e_is, e_fs):
                 raise ValueError("abnormal energies: {}".format(value))
 
+        _check_template(getattr(instance, "template", False),
+                        getattr(instance, "interp_method", None),
+                        getattr(instance, "sampling", "uniform"),
+                        value)
+
 
 class ElementaryReaction(DescriptorBase):
     """ Descriptor for elementary reaction.
@@ -72,10 +97,68 @@ class InterpolationMethod(DescriptorBase):
         super(InterpolationMethod, self).__init__(name)
 
     def _check(self, instance, value):
-        candidates = ["spline", "quadratic"]
+        candidates = ["spline", "quadratic", "hermite"]
         if value not in candidates:
             raise ValueError("inter)p_method must be one of {}.".format(candidates))
 
+        _check_template(getattr(instance, "template", False),
+                        value,
+                        getattr(instance, "sampling", "uniform"),
+                        getattr(instance, "energies", None))
+
+
+class SamplingMethod(DescriptorBase):
+    """ Descriptor for point sampling method of energy profile line.
+    """
+    def __init__(self, name):
+        super(SamplingMethod, self).__init__(name)
+
+    def _check(self, instance, value):
+        candidates = ["uniform", "adaptive"]
+        if value not in candidates:
+            raise ValueError("sampling must be one of {}.".format(candidates))
+
+        _check_template(getattr(instance, "template", False),
+                        getattr(instance, "interp_method", None),
+                        value,
+                        getattr(instance, "energies", None))
+
+
+class SamplingTolerance(DescriptorBase):
+    """ Descriptor for the vertical error tolerance of adaptive sampling.
+    """
+    def __init__(self, name):
+        super(SamplingTolerance, self).__init__(name)
+
+    def _check(self, instance, value):
+        if not value > 0.0:
+            raise ValueError("tolerance must be positive")
+
+
+class BarrierTemplate(DescriptorBase):
+    """ Descriptor for the switch of barrier templates of energy profile line.
+    """
+    def __init__(self, name):
+        super(BarrierTemplate, self).__init__(name)
+
+    def _check(self, instance, value):
+        _check_template(value,
+                        getattr(instance, "interp_method", None),
+                        getattr(instance, "sampling", "uniform"),
+                        getattr(instance, "energies", None))
+
+
+class RenderMode(DescriptorBase):
+    """ Descriptor for rendering mode of energy profile lines.
+    """
+    def __init__(self, name):
+        super(RenderMode, self).__init__(name)
+
+    def _check(self, instance, value):
+        candidates = ["lines", "collection"]
+        if value not in candidates:
+            raise ValueError("render_mode must be one of {}.".format(candidates))
+
 
 class MarginRatio(DescriptorBase):
     """ Descriptor for canvas margin ratio.
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Module for kinetic analysis of energy profiles with the energetic span model.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+
+# Results of energetic span analysis, tdts, tdi and rds are indices of steps.
+EnergeticSpan = namedtuple("EnergeticSpan", ["span", "tdts", "tdi",
+                                             "max_barrier", "rds"])
+
+
+def get_energy_table(energies):
+    """ Get energies of an elementary reaction sequence with shape (N, 3),
+    the TS of a step without barrier is NaN.
+
+    Parameters:
+    -----------
+    energies: 2-D array or list of tuples,
+        energies of elementary reactions, each row is (E_IS, E_TS, E_FS)
+        or (E_IS, E_FS).
+    """
+    table = np.full((len(energies), 3), np.nan)
+    for row, entry in enumerate(energies):
+        if len(entry) == 3:
+            table[row] = entry
+        elif len(entry) == 2:
+            table[row, [0, 2]] = entry
+        else:
+            raise ValueError("abnormal energies: {}".format(entry))
+
+    return table
+
+
+def energetic_spans(energy_tables):
+    """ Energetic span analysis for many reaction sequences in one pass,
+    sequences with different step numbers are padded.
+
+    The step energies of each sequence are joined end to end like an EPChain,
+    for intermediate I_j (IS of step j) and transition state T_i (TS of step i),
+
+        dE_ij = T_i - I_j           if i >= j
+        dE_ij = T_i - I_j + dG_r    if i < j
+
+    where dG_r is the reaction energy of the whole sequence. The energetic span
+    is the maximum of dE_ij, T_i is the TOF-determining transition state (TDTS)
+    and I_j is the TOF-determining intermediate (TDI). The top of a step
+    without barrier is the higher one of its IS and FS.
+
+    Parameters:
+    -----------
+    energy_tables: list of 2-D arrays, lists of tuples or EPChain objects,
+        energies of steps in each sequence, each row is (E_IS, E_TS, E_FS),
+        (E_IS, E_FS) or (E_IS, NaN, E_FS) for a step without barrier.
+
+    Returns:
+    --------
+    EnergeticSpan namedtuple of 1-D arrays,
+        span: energetic spans,
+        tdts: step indices of TDTS,
+        tdi: step indices of TDI,
+        max_barrier: the highest barriers of steps,
+        rds: step indices of the highest barriers.
+    """
+    tables = [get_energy_table(getattr(table, "energy_table", table))
+              for table in energy_tables]
+    nchains = len(tables)
+    nsteps = max([len(table) for table in tables] + [1])
+
+    # Padded energies, a padded step is a flat step with zero energies.
+    energies = np.zeros((nchains, nsteps, 3))
+    valid = np.zeros((nchains, nsteps), dtype=bool)
+    for idx, table in enumerate(tables):
+        energies[idx, :len(table)] = table
+        valid[idx, :len(table)] = True
+
+    if not np.all(valid.any(axis=1)):
+        raise ValueError("empty energy table")
+
+    e_is, e_ts, e_fs = energies[..., 0], energies[..., 1], energies[..., 2]
+    net = np.where(valid, e_fs - e_is, 0.0)
+    tops = np.where(np.isnan(e_ts), np.maximum(e_is, e_fs), e_ts) - e_is
+
+    # Energies of intermediates and transition states along sequences.
+    intermediates = np.cumsum(net, axis=1) - net
+    transition_states = intermediates + tops
+    reaction_energies = net.sum(axis=1)
+
+    # dE[m, i, j] for TS i and intermediate j of sequence m.
+    before = np.tri(nsteps, k=-1, dtype=bool).T
+    delta = transition_states[:, :, np.newaxis] - intermediates[:, np.newaxis, :]
+    delta += np.where(before, reaction_energies[:, np.newaxis, np.newaxis], 0.0)
+    delta[~(valid[:, :, np.newaxis] & valid[:, np.newaxis, :])] = -np.inf
+
+    flat_indices = np.argmax(delta.reshape(nchains, -1), axis=1)
+    tdts, tdi = np.unravel_index(flat_indices, (nsteps, nsteps))
+    spans = delta.reshape(nchains, -1)[np.arange(nchains), flat_indices]
+
+    barriers = np.where(valid, tops, -np.inf)
+    rds = np.argmax(barriers, axis=1)
+    max_barriers = barriers[np.arange(nchains), rds]
+
+    return EnergeticSpan(spans, tdts, tdi, max_barriers, rds)
+
+
+def energetic_span(energies):
+    """ Energetic span analysis for a reaction sequence.
+
+    Parameters:
+    -----------
+    energies: 2-D array or list of tuples, energies of steps in sequence.
+
+    Returns:
+    --------
+    EnergeticSpan namedtuple of span, tdts, tdi, max_barrier and rds,
+    see `energetic_spans` for details.
+    """
+    results = energetic_spans([energies])
+    return EnergeticSpan(float(results.span[0]),
+                         int(results.tdts[0]),
+                         int(results.tdi[0]),
+                         float(results.max_barrier[0]),
+                         int(results.rds[0]))
@@ -1,20 +1,26 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
 
+import matplotlib as mpl
 import matplotlib.pyplot as plt
 from matplotlib import transforms
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba
 from matplotlib.lines import Line2D
 from matplotlib.patches import Ellipse
 from matplotlib.spines import Spine
 import numpy as np
 
+import catplot.descriptors as dc
 from catplot.canvas import Canvas
 from catplot.chem_parser import RxnEquation
 from catplot.ep_components.ep_lines import EPLine
 from catplot.ep_components.ep_chain import EPChain
 from catplot.ep_components.ep_lines import ElementaryLine
+from catplot.ep_components.ep_line_array import ElementaryLineArray
+from catplot.ep_components.item_list import ItemList
 
 
 class EPCanvas(Canvas):
@@ -43,11 +49,24 @@ class EPCanvas(Canvas):
     y_ticks : float list
         set the y ticks with a list of ticks.
 
+    render_mode : str, optional, default is "lines"
+        "lines" draws a Line2D for each line, "collection" draws lines with
+        the same color and width as one LineCollection which is much faster
+        for thousands of lines.
+
     """
+    render_mode = dc.RenderMode("render_mode")
+
     def __init__(self, **kwargs):
+        self.render_mode = kwargs.pop("render_mode", "lines")
         super(EPCanvas, self).__init__(**kwargs)
         self._set_axes()
 
+        # Bounds of lines and line arrays with their versions and the
+        # bounding box of them.
+        self._bounds = {}
+        self._bbox = None
+
         # Energy profile lines.
         self.lines = []
         self.shadow_lines = []
@@ -55,6 +74,13 @@ class EPCanvas(Canvas):
         # Energy profile chains.
         self.chains = []
 
+        # Columnar containers of energy profile lines.
+        self.line_arrays = []
+
+        # Artists drawn for lines, line arrays and decorations.
+        self._decorations = OrderedDict()
+        self._reset_artists()
+
     def add_line(self, ep_line):
         """ Add an energy profile line to canvas.
         """
@@ -65,14 +91,85 @@ class EPCanvas(Canvas):
             msg = "the line is already in canvas, try to add the copy of it if you want."
             raise ValueError(msg)
 
-        self.lines.append(ep_line)
+        self._lines.add([ep_line])
+
+    @property
+    def lines(self):
+        """ Energy profile lines in canvas, the list can be changed in place.
+        """
+        return self._lines
+
+    @lines.setter
+    def lines(self, lines):
+        self._lines = ItemList(lines)
+        self._line_ids = self._lines.positions
+
+    @property
+    def line_arrays(self):
+        """ Columnar containers of energy profile lines in canvas.
+        """
+        return self._line_arrays
+
+    @line_arrays.setter
+    def line_arrays(self, line_arrays):
+        self._line_arrays = ItemList(line_arrays)
+        self._line_array_ids = self._line_arrays.positions
+
+    @property
+    def chains(self):
+        """ Energy profile chains in canvas.
+        """
+        return self._chains
+
+    @chains.setter
+    def chains(self, chains):
+        self._chains = ItemList(chains)
+        self._chain_ids = self._chains.positions
+
+    def _check_batch(self, items, ids, cls, name):
+        """ Private helper function to check a batch of items to be added,
+        ids is the identity index of the same kind of items in canvas.
+        """
+        items = list(items)
+        if not all(isinstance(item, cls) for item in items):
+            raise ValueError("{} added must be instance of {}".format(name, cls.__name__))
+
+        new_ids = set(id(item) for item in items)
+        if len(new_ids) != len(items) or any(key in ids for key in new_ids):
+            msg = "the {} is already in canvas, try to add the copy of it if you want."
+            raise ValueError(msg.format(name))
+
+        return items
 
     def add_lines(self, ep_lines):
-        """ Add energy profile lines to canvas.
+        """ Add energy profile lines to canvas, lines are checked once for
+        the whole batch and nothing is added if any of them is invalid.
+
+        Parameters:
+        -----------
+        ep_lines: list of ElementaryLine or an ElementaryLineArray.
         """
+        if isinstance(ep_lines, ElementaryLineArray):
+            self.add_line_array(ep_lines)
+            return
+
         # Check lines before adding.
-        for line in ep_lines:
-            self.add_line(line)
+        lines = self._check_batch(ep_lines, self._line_ids, ElementaryLine, "line")
+
+        self._lines.add(lines)
+
+    def add_line_array(self, line_array):
+        """ Add an ElementaryLineArray to canvas, all lines in it are drawn
+        as one matplotlib LineCollection.
+        """
+        if not isinstance(line_array, ElementaryLineArray):
+            raise ValueError("line array added must be instance of ElementaryLineArray")
+
+        if line_array in self:
+            msg = "the line array is already in canvas, try to add the copy of it if you want."
+            raise ValueError(msg)
+
+        self._line_arrays.add([line_array])
 
     def add_chain(self, ep_chain):
         """ Add energy profile line chain to canvas.
@@ -84,14 +181,23 @@ class EPCanvas(Canvas):
             msg = "the chain is already in canvas, try to add the copy of it if you want."
             raise ValueError(msg)
 
-        self.chains.append(ep_chain)
-        self.lines.extend(ep_chain.elementary_lines)
+        self._chains.add([ep_chain])
+        self._add_chain_lines([ep_chain])
 
     def add_chains(self, ep_chains):
-        """ Add multiple energy profile chains to canvas.
+        """ Add multiple energy profile chains to canvas, chains are checked once
+        for the whole batch and nothing is added if any of them is invalid.
+        """
+        chains = self._check_batch(ep_chains, self._chain_ids, EPChain, "chain")
+
+        self._chains.add(chains)
+        self._add_chain_lines(chains)
+
+    def _add_chain_lines(self, chains):
+        """ Private helper function to add lines of chains without checking.
         """
-        for chain in ep_chains:
-            self.add_chain(chain)
+        for chain in chains:
+            self._lines.add(chain.elementary_lines)
 
     def add_all_horizontal_auxiliary_lines(self):
         """ Add horizontal auxiliary lines to all elementary lines in canvas.
@@ -126,37 +232,124 @@ class EPCanvas(Canvas):
         return self
 
     def _render_ep_lines(self):
-        """ Render energy profile lines in canvas.
+        """ Render shadows of energy profile lines in canvas, shadows at the
+        same depth level of all lines are rendered as one LineCollection.
+
+        Shadows are rendered again only if any line is added, removed or
+        changed, and shadows of the last drawing are removed from axes first.
         """
-        for line in self.lines:
-            for idx in range(line.shadow_depth):
-                identity_trans = transforms.IdentityTransform()
-                offset = transforms.ScaledTranslation(idx, -idx, identity_trans)
-                shadow_trans = self.axes.transData + offset
-
-                # Create matplotlib Line2D.
-                alpha = (line.shadow_depth-idx)/2.0/line.shadow_depth
-                shadow_line = Line2D(line.x, line.y,
-                                     linewidth=line.line_width,
-                                     color=line.shadow_color,
-                                     transform=shadow_trans,
-                                     alpha=alpha)
-                self.shadow_lines.append(shadow_line)
+        signature = tuple((id(line), line._version, line.shadow_color,
+                           line.shadow_depth, line.line_width) for line in self.lines)
+        signature += tuple((id(a), a._version) for a in self.line_arrays)
+        if signature == self._shadow_signature:
+            return
+        self._shadow_signature = signature
+
+        for shadow in self.shadow_lines:
+            self._remove_artist(shadow)
+        self.shadow_lines = []
+
+        # Shadow styles of all lines including lines in line arrays.
+        xs = [line.x for line in self.lines]
+        ys = [line.y for line in self.lines]
+        colors = [line.shadow_color for line in self.lines]
+        depths = [line.shadow_depth for line in self.lines]
+        widths = [line.line_width for line in self.lines]
+
+        for line_array in self.line_arrays:
+            x, y = line_array.points
+            xs.extend(x)
+            ys.extend(y)
+            colors.extend(line_array.shadow_colors)
+            depths.extend(line_array.shadow_depths)
+            widths.extend(line_array.line_widths)
+
+        identity_trans = transforms.IdentityTransform()
+        for idx in range(int(max(depths + [0]))):
+            indices = [i for i, depth in enumerate(depths) if depth > idx]
+            offset = transforms.ScaledTranslation(idx, -idx, identity_trans)
+            shadow_trans = self.axes.transData + offset
+
+            segments = self._pack_segments([xs[i] for i in indices], [ys[i] for i in indices])
+            rgba = [to_rgba(colors[i], (depths[i]-idx)/2.0/depths[i]) for i in indices]
+            # Shadows are always below the lines.
+            shadow = self._line_collection(segments, rgba, [widths[i] for i in indices],
+                                           transform=shadow_trans,
+                                           zorder=Line2D.zorder - 0.1)
+            self.axes.add_collection(shadow, autolim=False)
+            self.shadow_lines.append(shadow)
+
+    @staticmethod
+    def _pack_segments(xs, ys):
+        """ Private helper function to get segments for a LineCollection,
+        segments with the same length are packed into one array.
+        """
+        if len(set(len(x) for x in xs)) == 1:
+            return np.stack([np.vstack(xs), np.vstack(ys)], axis=-1)
+        return [np.column_stack([x, y]) for x, y in zip(xs, ys)]
+
+    @staticmethod
+    def _line_collection(segments, colors, linewidths, **kwargs):
+        """ Private helper function to create a LineCollection looking the same
+        as Line2D objects of the segments.
+        """
+        kwargs.setdefault("zorder", Line2D.zorder)
+        return LineCollection(segments,
+                              colors=colors,
+                              linewidths=linewidths,
+                              capstyle=mpl.rcParams["lines.solid_capstyle"],
+                              joinstyle=mpl.rcParams["lines.solid_joinstyle"],
+                              **kwargs)
+
+    def _on_bbox_edge(self, bounds):
+        """ Private helper function to check if bounds may define the bounding box.
+        """
+        if self._bbox is None:
+            return True
+        max_x, min_x, max_y, min_y = bounds
+        bbox_max_x, bbox_min_x, bbox_max_y, bbox_min_y = self._bbox
+        return (max_x >= bbox_max_x or min_x <= bbox_min_x or
+                max_y >= bbox_max_y or min_y <= bbox_min_y)
 
     def _get_data_limits(self):
         """ Private helper function to get the limits of data.
-        """
-        # Merge all data in energy profile lines.
-        all_x = np.concatenate([l.x for l in self.lines])
-        all_y = np.concatenate([l.y for l in self.lines])
 
-        max_x = np.max(all_x)
-        min_x = np.min(all_x)
+        The bounding box of all lines is maintained, only the bounds of lines
+        added or changed (by their versions) since the last query are computed,
+        it is computed again from cached bounds of lines only if a line
+        defining it is changed or removed.
+        """
+        items = OrderedDict((id(item), item) for item in self.lines)
+        items.update((id(item), item) for item in self.line_arrays)
+
+        # Removed lines.
+        for key in [key for key in self._bounds if key not in items]:
+            if self._on_bbox_edge(self._bounds.pop(key)[2]):
+                self._bbox = None
+
+        for key, item in items.items():
+            cached = self._bounds.get(key)
+            if cached is not None and cached[0] is item and cached[1] == item._version:
+                continue
+
+            bounds = (np.max(item.x), np.min(item.x), np.max(item.y), np.min(item.y))
+            self._bounds[key] = [item, item._version, bounds]
+
+            if self._bbox is None:
+                continue
+            if cached is not None and self._on_bbox_edge(cached[2]):
+                self._bbox = None
+            else:
+                self._bbox = (max(self._bbox[0], bounds[0]), min(self._bbox[1], bounds[1]),
+                              max(self._bbox[2], bounds[2]), min(self._bbox[3], bounds[3]))
 
-        max_y = np.max(all_y)
-        min_y = np.min(all_y)
+        if self._bbox is None:
+            all_bounds = np.array([cached[2] for cached in self._bounds.values()])
+            max_x, max_y = np.max(all_bounds[:, [0, 2]], axis=0)
+            min_x, min_y = np.min(all_bounds[:, [1, 3]], axis=0)
+            self._bbox = (max_x, min_x, max_y, min_y)
 
-        return self._limits(max_x, min_x, max_y, min_y)
+        return self._limits(*self._bbox)
 
     def add_species_annotations(self, ep_line):
         """ Add annoatates to a specific elementary energy profile line.
@@ -165,8 +358,13 @@ class EPCanvas(Canvas):
         -----------
         ep_line: EPLine object, the energy profile line.
         """
+        return self._decorate(self._species_annotations, ep_line)
+
+    def _species_annotations(self, ep_line):
+        """ Private helper function to create species annotation artists.
+        """
         if ep_line.rxn_equation is None:
-            return
+            return []
 
         eigen_pts = ep_line.eigen_points
         states = RxnEquation(ep_line.rxn_equation).tolist()
@@ -194,13 +392,51 @@ class EPCanvas(Canvas):
             params.append([x_t, y_t, note_t])
 
         # Add them to canvas.
+        artists = []
         for idx, param_list in enumerate(params):
             if idx == 2:
-                self.axes.text(*param_list, fontdict={"fontsize": 13, "color": "#CD5555"})
+                text = self.axes.text(*param_list, fontdict={"fontsize": 13, "color": "#CD5555"})
             else:
-                self.axes.text(*param_list, fontdict={'fontsize': 13, 'color': '#1874CD'})
+                text = self.axes.text(*param_list, fontdict={'fontsize': 13, 'color': '#1874CD'})
+            artists.append(text)
 
-        return self
+        return artists
+
+    def add_energetic_span_annotations(self, ep_chain, color="#CD5555"):
+        """ Highlight the TOF-determining transition state (TDTS) and
+        intermediate (TDI) of a chain.
+
+        Parameters:
+        -----------
+        ep_chain: EPChain object, the energy profile chain.
+        color: str, optional, color code of highlights, default is #CD5555.
+        """
+        return self._decorate(self._energetic_span_annotations, ep_chain, color=color)
+
+    def _energetic_span_annotations(self, ep_chain, color):
+        """ Private helper function to create TDTS and TDI highlight artists.
+        """
+        result = ep_chain.energetic_span()
+        lines = ep_chain.elementary_lines
+
+        # TDTS is the peak of line, or the higher end for a line without barrier.
+        eigen_pts = lines[result.tdts].eigen_points
+        if eigen_pts.has_barrier:
+            tdts = eigen_pts.C
+        else:
+            tdts = max(eigen_pts.A, eigen_pts.E, key=lambda point: point[1])
+
+        # TDI is the IS of line.
+        tdi = lines[result.tdi].eigen_points.A
+
+        note_offset = ep_chain.elementary_lines[result.tdts].scale_y/40
+        artists = []
+        for (x, y), note in [(tdts, "TDTS"), (tdi, "TDI")]:
+            artists.extend(self.axes.plot([x], [y], marker="o", markersize=8, color=color))
+            artists.append(self.axes.text(x, y + note_offset, r"$\bf{" + note + r"}$",
+                                          fontdict={"fontsize": 13, "color": color}))
+
+        return artists
 
     def add_horizontal_auxiliary_line(self, ep_line):
         """ Add horizontal auxiliary line to a specific energy profile line.
@@ -209,6 +445,11 @@ class EPCanvas(Canvas):
         -----------
         ep_line: EPLine object, the energy profile line.
         """
+        return self._decorate(self._horizontal_auxiliary_line, ep_line)
+
+    def _horizontal_auxiliary_line(self, ep_line):
+        """ Private helper function to create the horizontal auxiliary line artist.
+        """
         eigen_pts = ep_line.eigen_points
 
         # Horizontal auxiliary line.
@@ -219,7 +460,7 @@ class EPCanvas(Canvas):
         aux_line = Line2D(x, y, color="#595959", linewidth=1, linestyle="dashed")
         self.axes.add_line(aux_line)
 
-        return self
+        return [aux_line]
 
     def add_vertical_auxiliary_lines(self, ep_line):
         """ Add vertical auxiliary line to a specific energy profile line.
@@ -228,30 +469,38 @@ class EPCanvas(Canvas):
         -----------
         ep_line: EPLine object, the energy profile line.
         """
+        return self._decorate(self._vertical_auxiliary_lines, ep_line)
+
+    def _vertical_auxiliary_lines(self, ep_line):
+        """ Private helper function to create vertical auxiliary arrow artists.
+        """
         eigen_pts = ep_line.eigen_points
+        artists = []
 
         if eigen_pts.has_barrier:
             # Arrow between barrier.
             x = eigen_pts.C[0]
             y1 = eigen_pts.B[1]
             y2 = eigen_pts.C[1]
-            self.axes.annotate("", xy=(x, y1),
-                               xycoords="data",
-                               xytext=(x, y2),
-                               textcoords="data",
-                               arrowprops=dict(arrowstyle="<->"))
+            arrow = self.axes.annotate("", xy=(x, y1),
+                                       xycoords="data",
+                                       xytext=(x, y2),
+                                       textcoords="data",
+                                       arrowprops=dict(arrowstyle="<->"))
+            artists.append(arrow)
 
         # Arrow between reaction energy.
         x = (eigen_pts.D[0] + eigen_pts.E[0])/2.0
         y1 = eigen_pts.D[-1]
         y2 = eigen_pts.B[-1]
-        self.axes.annotate('', xy=(x, y1),
-                           xycoords="data",
-                           xytext=(x, y2),
-                           textcoords="data",
-                           arrowprops=dict(arrowstyle="<->"))
+        arrow = self.axes.annotate('', xy=(x, y1),
+                                   xycoords="data",
+                                   xytext=(x, y2),
+                                   textcoords="data",
+                                   arrowprops=dict(arrowstyle="<->"))
+        artists.append(arrow)
 
-        return self
+        return artists
 
     def add_energy_annotations(self, ep_line):
         """ Add energy related annotations to a specific energy profile line.
@@ -260,7 +509,13 @@ class EPCanvas(Canvas):
         -----------
         ep_line: EPLine object, the energy profile line.
         """
+        return self._decorate(self._energy_annotations, ep_line)
+
+    def _energy_annotations(self, ep_line):
+        """ Private helper function to create energy annotation artists.
+        """
         eigen_pts = ep_line.eigen_points
+        artists = []
 
         # Energy latex strings.
         if eigen_pts.has_barrier:
@@ -273,57 +528,212 @@ class EPCanvas(Canvas):
             # Text annotation for barrier.
             x = eigen_pts.C[0]
             y = (eigen_pts.B[1] + eigen_pts.C[1])/2.0
-            self.axes.annotate(act_energy_latex,
-                               xy=(x, y),
-                               xytext=(-150, 30),
-                               textcoords="offset points",
-                               size=13,
-                               color="#B22222",
-                               arrowprops=dict(arrowstyle="simple",
-                                               fc="0.6",
-                                               ec="none",
-                                               patchB=el,
-                                               connectionstyle="arc3,rad=0.2"))
+            note = self.axes.annotate(act_energy_latex,
+                                      xy=(x, y),
+                                      xytext=(-150, 30),
+                                      textcoords="offset points",
+                                      size=13,
+                                      color="#B22222",
+                                      arrowprops=dict(arrowstyle="simple",
+                                                      fc="0.6",
+                                                      ec="none",
+                                                      patchB=el,
+                                                      connectionstyle="arc3,rad=0.2"))
+            artists.append(note)
 
         # Text annotation for reaction energy.
         x = (eigen_pts.D[0] + eigen_pts.E[0])/2.0
         y = (eigen_pts.D[1] + eigen_pts.B[1])/2.0
-        self.axes.annotate(rxn_energy_latex,
-                           xy=(x, y),
-                           xytext=(50, 30),
-                           textcoords="offset points",
-                           size=13,
-                           color="#8E388E",
-                           arrowprops=dict(arrowstyle="simple",
-                                           fc="0.6",
-                                           ec="none",
-                                           patchB=el,
-                                           connectionstyle="arc3,rad=0.2"))
+        note = self.axes.annotate(rxn_energy_latex,
+                                  xy=(x, y),
+                                  xytext=(50, 30),
+                                  textcoords="offset points",
+                                  size=13,
+                                  color="#8E388E",
+                                  arrowprops=dict(arrowstyle="simple",
+                                                  fc="0.6",
+                                                  ec="none",
+                                                  patchB=el,
+                                                  connectionstyle="arc3,rad=0.2"))
+        artists.append(note)
+
+        return artists
+
+    def _decorate(self, create, target, **kwargs):
+        """ Private helper function to add decoration artists of a line or chain,
+        the decoration is created again in drawing if the target changes and
+        removed if the target in canvas is removed from it.
+
+        Parameters:
+        -----------
+        create: method creating artists for the target.
+        target: ElementaryLine or EPChain object.
+        """
+        key = (create.__name__, id(target))
+        if key in self._decorations:
+            for artist in self._decorations[key][2] or []:
+                self._remove_artist(artist)
+
+        artists = create(target, **kwargs)
+        self._decorations[key] = [target, self._version_of(target), artists, create, kwargs,
+                                  target in self]
 
         return self
 
+    @staticmethod
+    def _version_of(item):
+        """ Private helper function to get the version of a line or chain.
+        """
+        if isinstance(item, EPChain):
+            return tuple(line._version for line in item.elementary_lines)
+        return item._version
+
+    @staticmethod
+    def _remove_artist(artist):
+        """ Private helper function to remove an artist from axes if it is there.
+        """
+        try:
+            artist.remove()
+        except (ValueError, NotImplementedError):
+            pass
+
     def draw(self):
         """ Draw all lines to canvas.
+
+        Only the artists of lines, line arrays and decorations which are added
+        or changed since the last drawing are created or updated.
         """
-        if not self.lines:
+        if not (self.lines or self.line_arrays):
             raise AttributeError("Can't draw an empty canvas")
 
-        # Render energy profile lines.
+        # Render shadows of energy profile lines.
         self._render_ep_lines()
 
-        # Draw shadows.
-        for shadow_line in self.shadow_lines:
-            self.axes.add_line(shadow_line)
-
-        # Draw energy profile lines.
-        for line in self.lines:
-            self.axes.add_line(line.line2d())
+        # Draw energy profile lines, artists of the other mode are removed.
+        if self.render_mode == "collection":
+            self._remove_stale(self._line2ds, ())
+            self._draw_line_collections()
+        else:
+            self._remove_stale(self._collections, ())
+            self._draw_line2ds()
+
+        # Draw line arrays.
+        self._draw_line_arrays()
+
+        # Remove decorations of targets removed from canvas.
+        for key, entry in list(self._decorations.items()):
+            target, artists, in_canvas = entry[0], entry[2], entry[5]
+            if in_canvas and target not in self:
+                for artist in artists or []:
+                    self._remove_artist(artist)
+                del self._decorations[key]
+
+        # Update decorations of changed lines.
+        for entry in self._decorations.values():
+            target, version, artists, create, kwargs, _ = entry
+            current_version = self._version_of(target)
+            if version != current_version or artists is None:
+                for artist in artists or []:
+                    self._remove_artist(artist)
+                entry[1:3] = [current_version, create(target, **kwargs)]
 
         # Set axes limits.
         limits = self._get_data_limits()
         self.axes.set_xlim(limits.min_x, limits.max_x)
         self.axes.set_ylim(limits.min_y, limits.max_y)
 
+    def _remove_stale(self, artists, ids):
+        """ Private helper function to remove artists whose keys are not in ids.
+        """
+        for key in [key for key in artists if key not in ids]:
+            self._remove_artist(artists.pop(key)[1])
+
+    def _draw_line2ds(self):
+        """ Private helper function to add or update a Line2D for each line.
+        """
+        self._remove_stale(self._line2ds, self._line_ids)
+
+        for line in self.lines:
+            entry = self._line2ds.get(id(line))
+            if entry is None:
+                artist = line.line2d()
+                self.axes.add_line(artist)
+                self._line2ds[id(line)] = [line, artist, line._version]
+                continue
+
+            _, artist, version = entry
+            if version != line._version:
+                artist.set_data(line.x, line.y)
+                entry[2] = line._version
+
+            if artist.get_color() != line.color or artist.get_linewidth() != line.line_width:
+                artist.set_color(line.color)
+                artist.set_linewidth(line.line_width)
+
+    def _draw_line_collections(self):
+        """ Private helper function to add or update a LineCollection for each
+        group of lines with the same style, only changed groups are rebuilt.
+        """
+        groups = OrderedDict()
+        for line in self.lines:
+            groups.setdefault((line.color, line.line_width), []).append(line)
+
+        signatures = {}
+        for style, lines in groups.items():
+            signatures[style] = tuple((id(line), line._version) for line in lines)
+
+        self._remove_stale(self._collections, signatures)
+
+        for style, lines in groups.items():
+            entry = self._collections.get(style)
+            if entry is not None and entry[0] == signatures[style]:
+                continue
+
+            if entry is not None:
+                self._remove_artist(entry[1])
+
+            color, line_width = style
+            segments = self._pack_segments([line.x for line in lines],
+                                           [line.y for line in lines])
+            collection = self._line_collection(segments, color, line_width)
+            self.axes.add_collection(collection, autolim=False)
+            self._collections[style] = [signatures[style], collection]
+
+    def _draw_line_arrays(self):
+        """ Private helper function to add or update a LineCollection for
+        each line array.
+        """
+        ids = set(id(line_array) for line_array in self.line_arrays)
+        self._remove_stale(self._array_collections, ids)
+
+        for line_array in self.line_arrays:
+            entry = self._array_collections.get(id(line_array))
+            if entry is not None and entry[2] == line_array._version:
+                continue
+
+            if entry is not None:
+                self._remove_artist(entry[1])
+
+            x, y = line_array.points
+            collection = self._line_collection(np.stack([x, y], axis=-1),
+                                               line_array.colors.tolist(),
+                                               line_array.line_widths)
+            self.axes.add_collection(collection, autolim=False)
+            self._array_collections[id(line_array)] = [line_array, collection,
+                                                       line_array._version]
+
+    def _reset_artists(self):
+        """ Private helper function to forget all artists drawn, decorations
+        are kept and created again in the next drawing.
+        """
+        self.shadow_lines = []
+        self._shadow_signature = None
+        self._line2ds = {}
+        self._collections = {}
+        self._array_collections = {}
+        for entry in self._decorations.values():
+            entry[2] = None
+
     def redraw(self):
         """ Clear current content in canvas and draw all lines again.
         """
@@ -334,6 +744,7 @@ class EPCanvas(Canvas):
         """ Clear the canvas (only the lines in canvas.axes).
         """
         self.axes.clear()
+        self._reset_artists()
 
     def deep_clear(self):
         """ Clear all lines in canvas and canvas.axes
@@ -341,7 +752,8 @@ class EPCanvas(Canvas):
         self.clear()
         self.lines = []
         self.chains = []
-        self.shadow_lines = []
+        self.line_arrays = []
+        self._decorations = OrderedDict()
 
     # -------------------------------------------------------------------------
     # Magic method to change the default behaviours.
@@ -351,8 +763,11 @@ class EPCanvas(Canvas):
         """ Membership test operators.
         """
         if isinstance(item, ElementaryLine):
-            return item in self.lines
+            return id(item) in self._line_ids
 
         if isinstance(item, EPChain):
-            return item in self.chains
+            return id(item) in self._chain_ids
+
+        if isinstance(item, ElementaryLineArray):
+            return id(item) in self._line_array_ids
 
@@ -4,19 +4,92 @@
 """ Module for elementary energy profile line chain.
 """
 
-import csv
+import gzip
+import os
 
 import numpy as np
 
+from catplot.ep_components.ep_analysis import energetic_span, get_energy_table
+from catplot.ep_components.ep_lines import export_ep_data, format_csv_rows
+from catplot.ep_components.ep_line_array import ElementaryLineArray
+from catplot.ep_components.item_list import ItemList
+
 
 class EPChain(object):
     """ Chain for multiple elementary energy profile lines joined together.
+
+    Parameters:
+    -----------
+    elementary_lines: list of ElementaryLine or ElementaryLineArray,
+        lines in the chain, an ElementaryLineArray is expanded in a vectorized
+        way and its lines keep points in the buffer of array.
+
+    Points of all lines are packed in one contiguous buffer on the first
+    access of `x` or `y`, the points of each line are then views of it.
     """
     def __init__(self, elementary_lines):
+        # Contiguous x and y buffers and the offsets of lines in them.
+        self._buffer = None
+        self._offsets = None
+
+        if isinstance(elementary_lines, ElementaryLineArray):
+            line_array = elementary_lines.expand()
+            elementary_lines = line_array.to_lines()
+            self._buffer = (line_array.x, line_array.y)
+            self._offsets = line_array.offsets
+            expanded = True
+        else:
+            expanded = False
+
         self.elementary_lines = elementary_lines
 
         # Expand all elementary lines.
-        self.expand(self.elementary_lines)
+        if not expanded:
+            self.expand(self.elementary_lines)
+
+    @classmethod
+    def from_energies(cls, energies, **kwargs):
+        """ Create a chain from a table of energies in a batched way, lines are
+        validated and interpolated together in an ElementaryLineArray.
+
+        Parameters:
+        -----------
+        energies: 2-D array or list of tuples,
+            energies of elementary reactions in chain, each row is
+            (E_IS, E_TS, E_FS) or (E_IS, E_FS), NaN TS for a line without barrier.
+
+        hline_lengths: float or 1-D array, optional
+            the length of the horizontal line for the IS and FS, default is 1.0.
+
+        peak_widths: float or 1-D array, optional
+            the width of the peak in energy profile, default is 1.0.
+
+        n: int, optional
+            the point number in each state, default is 100.
+
+        interp_method: str, optional
+            the type of interpolation algorithm, default is "spline".
+
+        dtype: data-type, optional
+            data type of x and y values, default is np.float64.
+
+        color, line_width, shadow_color, shadow_depth: optional
+            styles of lines, a single value for all lines or one for each line.
+
+        Example:
+        --------
+        >>> chain = EPChain.from_energies([(0.0, 1.2, 0.6), (0.0, 0.8)], color="#ff0000")
+
+        """
+        styles = {"color": "colors",
+                  "line_width": "line_widths",
+                  "shadow_color": "shadow_colors",
+                  "shadow_depth": "shadow_depths"}
+        for name, column in styles.items():
+            if name in kwargs:
+                kwargs[column] = kwargs.pop(name)
+
+        return cls(ElementaryLineArray(energies, **kwargs))
 
     def __check_elementary_lines(self, lines):
         for line in lines:
@@ -24,33 +97,120 @@ class EPChain(object):
                 msg = "Entry in elementary line list must be ElementaryLine obejct."
                 raise ValueError(msg)
 
+    @property
+    def dtype(self):
+        """ Data type of x and y values for lines in chain.
+        """
+        return np.result_type(*[line.dtype for line in self.elementary_lines])
+
     @property
     def x(self):
-        """ All x values for lines in chain.
+        """ All x values for lines in chain, the buffer shared with lines.
         """
-        return np.concatenate([line.x for line in self.elementary_lines])
+        return self._pack()[0]
 
     @property
     def y(self):
-        """ All y values for lines in chain.
+        """ All y values for lines in chain, the buffer shared with lines.
+        """
+        return self._pack()[1]
+
+    def _pack(self):
+        """ Private helper function to pack points of all lines into contiguous
+        buffers and make the points of lines views of them.
+        """
+        if self._buffer is not None:
+            return self._buffer
+
+        lines = self.elementary_lines
+        x = np.concatenate([line.x for line in lines])
+        y = np.concatenate([line.y for line in lines])
+
+        # Lines with different data types can not share the buffer.
+        if any(line.dtype != x.dtype for line in lines):
+            return x, y
+
+        lengths = [len(line.x) for line in lines]
+        offsets = np.concatenate([[0], np.cumsum(lengths)])
+        for line, start, end in zip(lines, offsets[:-1], offsets[1:]):
+            line._x, line._y = x[start: end], y[start: end]
+
+            # Points are no longer shared with the line array.
+            line._array = None
+
+        self._buffer = (x, y)
+        self._offsets = offsets
+
+        return self._buffer
+
+    @property
+    def elementary_lines(self):
+        """ Lines in chain, the list indexes lines by identity and can be
+        changed in place.
+        """
+        return self._lines
+
+    @elementary_lines.setter
+    def elementary_lines(self, elementary_lines):
+        self._lines = ItemList(elementary_lines, on_change=self._lines_changed)
+        self._link()
+
+    def _lines_changed(self):
+        """ Private helper function called when the list of lines is changed in
+        place, the buffers are dropped as the lines may be moved.
+        """
+        self._link()
+        self._invalidate()
+
+    def _link(self):
+        """ Private helper function to set the back-references of lines to the chain.
         """
-        return np.concatenate([line.y for line in self.elementary_lines])
+        for line in self._lines:
+            line._chain = self
+
+    def _index(self, elementary_line):
+        """ Private helper function to get the position of a line in chain,
+        None if the line is not in chain.
+        """
+        return self._lines.position(elementary_line)
+
+    def _invalidate(self):
+        """ Private helper function to drop the buffers when points of a line
+        are replaced, the buffers are packed again on the next access.
+        """
+        self._buffer = None
+        self._offsets = None
 
     @staticmethod
-    def expand(elementary_lines):
+    def _end_points(elementary_lines):
+        """ Private helper function to get the point E of lines with shape (N, 2)
+        from their origins and spans, no interpolation or peak search is needed.
+        """
+        ends = np.empty((len(elementary_lines), 2))
+        for idx, line in enumerate(elementary_lines):
+            origin_x, origin_y = line._get_origin()
+            energies = line.energies
+            ends[idx] = (origin_x + 2*line.hline_length + line.peak_width,
+                         origin_y + energies[-1])
+        return ends
+
+    @classmethod
+    def expand(cls, elementary_lines):
         """ Expand all elementary lines by translation operations.
             _
             _   ->  _ _ _
             _   ->
 
+        The translation of each line is the cumulative sum of end points of
+        previous lines which is computed at once.
         """
-        for idx, line in enumerate(elementary_lines):
-            if idx == 0:
-                continue
+        if len(elementary_lines) < 2:
+            return
 
-            # Translate current line.
-            prev_line = elementary_lines[idx-1]
-            trans_x, trans_y = prev_line.eigen_points.E
+        ends = cls._end_points(elementary_lines[:-1])
+        translations = np.cumsum(ends, axis=0).tolist()
+
+        for line, (trans_x, trans_y) in zip(elementary_lines[1:], translations):
             line.translate(trans_x, "x").translate(trans_y, "y")
 
     def translate(self, distance, direction="x"):
@@ -61,8 +221,20 @@ class EPChain(object):
         distance: float, translation distance.
         direction: str, translation direction ("x", "y").
         """
-        for line in self.elementary_lines:
-            line.translate(distance, direction)
+        if direction not in ("x", "y"):
+            raise ValueError("Invalide direction {}".format(direction))
+
+        if self._buffer is not None:
+            # All points are translated by one operation on the buffer.
+            x, y = self._buffer
+            data = x if direction == "x" else y
+            data += distance
+
+            for line in self.elementary_lines:
+                line._touch()
+        else:
+            for line in self.elementary_lines:
+                line.translate(distance, direction)
 
         return self
 
@@ -73,9 +245,43 @@ class EPChain(object):
             msg = "Can't append a line in chain, try to append a copy of it."
             raise ValueError(msg)
 
-        trans_x, trans_y = self.elementary_lines[-1].eigen_points.E
+        trans_x, trans_y = self._end_points(self.elementary_lines[-1:])[0].tolist()
         elementary_line.translate(trans_x, "x").translate(trans_y, "y")
-        self.elementary_lines.append(elementary_line)
+        self._lines.add([elementary_line])
+        elementary_line._chain = self
+        self._invalidate()
+
+    def _propagate(self, elementary_line, distance):
+        """ Translate all lines after a specific line along Y axis,
+        it is used when the FS of the line is translated.
+        """
+        # Nothing to follow if the line has been removed from chain.
+        idx = self._index(elementary_line)
+
+        if idx is not None and self._buffer is not None:
+            self._buffer[1][self._offsets[idx+1]:] += distance
+            for line in self.elementary_lines[idx+1:]:
+                line._touch()
+        elif idx is not None:
+            for line in self.elementary_lines[idx+1:]:
+                line.translate(distance, "y")
+
+    @property
+    def energy_table(self):
+        """ Relative energies of lines in chain with shape (N, 3),
+        the TS of a line without barrier is NaN.
+        """
+        return get_energy_table([line.energies for line in self.elementary_lines])
+
+    def energetic_span(self):
+        """ Energetic span analysis of the chain as a catalytic cycle.
+
+        Returns:
+        --------
+        EnergeticSpan namedtuple of span, tdts, tdi, max_barrier and rds,
+        tdts, tdi and rds are indices of lines in chain.
+        """
+        return energetic_span(self.energy_table)
 
     @property
     def scale_x(self):
@@ -86,13 +292,22 @@ class EPChain(object):
 
         return max_x - min_x
 
-    def export(self, filename):
-        """ Export line data to file.
+    def export(self, filename, chunksize=100000):
+        """ Export line data to file, ".npy" and ".npz" files are written in
+        binary format and others in csv format, the ".npz" file also keeps
+        the offsets of lines which can be read by `load_ep_data`.
+
+        The csv file is written line by line in chunks and compressed
+        by gzip if the filename ends with ".gz".
         """
-        with open(filename, "w") as f:
-            writer = csv.writer(f)
-            for data in zip(self.x, self.y):
-                writer.writerow(data)
+        ext = os.path.splitext(filename)[1].lower()
+
+        if ext in (".npy", ".npz"):
+            lengths = [len(line.x) for line in self.elementary_lines]
+            offsets = np.concatenate([[0], np.cumsum(lengths)])
+            export_ep_data(filename, self.x, self.y, offsets)
+        else:
+            export_chains([self], filename, chunksize=chunksize, chain_ids=False)
 
     def setattr(self, name, value):
         """ Set attriutes for all lines in chain.
@@ -107,10 +322,61 @@ class EPChain(object):
     def __contains__(self, item):
         """ Membership test operators.
         """
-        return item in self.elementary_lines
+        return self._index(item) is not None
 
     def __iter__(self):
         """ Make the chain iterable.
         """
         return iter(self.elementary_lines)
 
+    def __getstate__(self):
+        """ Leave the buffers and the index of lines out of pickles and copies,
+        they are rebuilt for the copied lines.
+        """
+        state = self.__dict__.copy()
+        state.update(_buffer=None, _offsets=None, _lines=list(self._lines))
+        return state
+
+    def __setstate__(self, state):
+        """ Link the lines to a pickled or copied chain.
+        """
+        state = dict(state)
+        lines = state.pop("_lines")
+        self.__dict__.update(state)
+        self.elementary_lines = lines
+
+
+
+def export_chains(chains, filename, chunksize=100000, chain_ids=True):
+    """ Export data of multiple chains to one csv file without concatenating
+    all points in memory, rows of lines are formatted and written in chunks.
+
+    Parameters:
+    -----------
+    chains: list of EPChain, chains to be exported.
+
+    filename: str, name of the output file, the file is compressed by gzip
+        if the filename ends with ".gz".
+
+    chunksize: int, optional
+        the row number written in one chunk, default is 100000.
+
+    chain_ids: bool, optional
+        add a leading column of chain indices, default is True.
+
+    Values are formatted by `format_csv_rows` like `EPLine.export`.
+    """
+    if chunksize < 1:
+        raise ValueError("Invalide chunksize {}".format(chunksize))
+
+    opener = gzip.open if filename.endswith(".gz") else open
+
+    with opener(filename, "wb") as f:
+        for chain_id, chain in enumerate(chains):
+            prefix = "{},".format(chain_id) if chain_ids else ""
+            for line in chain:
+                for start in range(0, len(line.x), chunksize):
+                    rows = format_csv_rows(line.x[start: start+chunksize],
+                                           line.y[start: start+chunksize],
+                                           prefix)
+                    f.write(rows.encode("ascii"))
@@ -0,0 +1,259 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Module for columnar container of many elementary energy profile lines.
+"""
+
+import numpy as np
+
+from catplot.interpolate import batch_potential_energy_points
+from catplot.ep_components.ep_analysis import get_energy_table
+from catplot.ep_components.ep_lines import ElementaryLine
+
+
+class ElementaryLineArray(object):
+    """ Struct-of-arrays container for many elementary energy profile lines,
+    the points of all lines are packed in one coordinate buffer.
+
+    Parameters:
+    -----------
+    energies: 2-D array or list of tuples,
+        energies for states of elementary reactions, each row is
+        (E_IS, E_TS, E_FS) or (E_IS, E_FS).
+
+    n: int, optional
+        the point number in each state, default is 100.
+
+    hline_lengths: float or 1-D array, optional
+        the length of the horizontal line for the IS and FS, default is 1.0.
+
+    peak_widths: float or 1-D array, optional
+        the width of the peak in energy profile, default is 1.0.
+
+    interp_method: str, optional
+        the type of interpolation algorithm("spline", "quadratic", "hermite")
+        default is "spline".
+
+    line_widths: float or 1-D array, optional
+        line width, default is 3.
+
+    colors: str or str list, optional,
+        color code of lines, default is #000000 (black).
+
+    shadow_colors: str or str list, optional
+        color code of the shadow lines, default is #595959.
+
+    shadow_depths: int or 1-D array, optional
+        shadow depth of lines, default is 0, no shadow.
+
+    dtype: data-type, optional
+        data type of x and y values, default is np.float64.
+    """
+    # Version of the array increased whenever its points change.
+    _version = 0
+
+    # The array whose buffer the points of a sliced array are views of.
+    _base = None
+
+    def __init__(self, energies, **kwargs):
+        self.n = kwargs.pop("n", 100)
+        self.interp_method = kwargs.pop("interp_method", "spline")
+        self.dtype = np.dtype(kwargs.pop("dtype", np.float64))
+
+        # Relative energies with NaN TS for lines without barrier.
+        self.energies, self.has_barrier = self._get_energy_table(energies)
+        nlines = len(self.energies)
+
+        self.hline_lengths = self._broadcast(kwargs.pop("hline_lengths", 1.0), nlines)
+        self.peak_widths = self._broadcast(kwargs.pop("peak_widths", 1.0), nlines)
+        self.line_widths = self._broadcast(kwargs.pop("line_widths", 3), nlines)
+        self.colors = self._broadcast(kwargs.pop("colors", "#000000"), nlines, object)
+        self.shadow_colors = self._broadcast(kwargs.pop("shadow_colors", "#595959"), nlines, object)
+        self.shadow_depths = self._broadcast(kwargs.pop("shadow_depths", 0), nlines)
+
+        # Interpolate all lines in batches of the same state number.
+        npts = 3*self.n
+        self.x = np.empty(nlines*npts, dtype=self.dtype)
+        self.y = np.empty(nlines*npts, dtype=self.dtype)
+        self.offsets = np.arange(nlines + 1)*npts
+
+        x, y = self.x.reshape(nlines, npts), self.y.reshape(nlines, npts)
+        for rows, columns in [(self.has_barrier, [0, 1, 2]), (~self.has_barrier, [0, 2])]:
+            if np.any(rows):
+                x[rows], y[rows] = batch_potential_energy_points(
+                    self.energies[rows][:, columns],
+                    n=self.n,
+                    hline_lengths=self.hline_lengths[rows],
+                    peak_widths=self.peak_widths[rows],
+                    kind=self.interp_method,
+                    dtype=self.dtype)
+
+    @staticmethod
+    def _get_energy_table(energies):
+        """ Private helper function to get relative energies with shape (N, 3).
+        """
+        table = get_energy_table(energies)
+        table -= table[:, :1]
+        has_barrier = ~np.isnan(table[:, 1])
+
+        return table, has_barrier
+
+    @staticmethod
+    def _broadcast(value, nlines, dtype=None):
+        """ Private helper function to get a parameter for each line.
+        """
+        if dtype is object and isinstance(value, str):
+            value = [value]*nlines
+        return np.array(np.broadcast_to(np.asarray(value, dtype=dtype), (nlines,)))
+
+    @classmethod
+    def _from_columns(cls, columns):
+        """ Private constructor from columns without interpolation.
+        """
+        line_array = cls.__new__(cls)
+        line_array.__dict__.update(columns)
+        return line_array
+
+    @property
+    def points(self):
+        """ Views of x and y values with shape (N, 3n).
+        """
+        nlines = len(self)
+        return self.x.reshape(nlines, -1), self.y.reshape(nlines, -1)
+
+    @property
+    def peak_indices(self):
+        """ Indices of peaks in the points of each line, -1 for lines without barrier.
+        """
+        x, y = self.points
+        indices = self.n + np.argmax(y[:, self.n:2*self.n], axis=1)
+        return np.where(self.has_barrier, indices, -1)
+
+    def translate(self, distance, direction="x"):
+        """ Translate all lines in array.
+
+        Parameters:
+        -----------
+        distance: float or 1-D array, translation distance for each line.
+        direction: str, translation direction ("x", "y").
+        """
+        if direction not in ("x", "y"):
+            raise ValueError("Invalide direction {}".format(direction))
+
+        x, y = self.points
+        data = x if direction == "x" else y
+        data += np.broadcast_to(np.asarray(distance), (len(self),))[:, np.newaxis]
+        self._touch()
+
+        # Return array itself for the chain operations.
+        return self
+
+    def _touch(self):
+        """ Private helper function to mark the points of array changed.
+        """
+        self._version += 1
+        if self._base is not None:
+            self._base._touch()
+
+    def expand(self):
+        """ Join all lines end to end like an EPChain, the first line is not moved.
+        """
+        x, y = self.points
+
+        # Where every line should start and where it is now.
+        widths = 2*self.hline_lengths + self.peak_widths
+        start_x = x[0, 0] + np.concatenate([[0.0], np.cumsum(widths[:-1])])
+        start_y = y[0, 0] + np.concatenate([[0.0], np.cumsum(self.energies[:-1, 2])])
+
+        self.translate(start_x - x[:, 0], "x")
+        self.translate(start_y - y[:, 0], "y")
+
+        return self
+
+    def line(self, index, peak_index=None):
+        """ Get an ElementaryLine whose points are views of the buffer,
+        the array is marked changed when the points of line change.
+        """
+        x, y = self.points
+        energies = self.energies[index]
+        if self.has_barrier[index]:
+            energies = energies.tolist()
+            if peak_index is None:
+                peak_index = int(self.n + np.argmax(y[index, self.n:2*self.n]))
+        else:
+            energies = energies[[0, 2]].tolist()
+            peak_index = None
+
+        line = ElementaryLine._from_points(energies, x[index], y[index],
+                                           n=self.n,
+                                           peak_index=peak_index,
+                                           hline_length=float(self.hline_lengths[index]),
+                                           peak_width=float(self.peak_widths[index]),
+                                           interp_method=self.interp_method,
+                                           color=self.colors[index],
+                                           shadow_color=self.shadow_colors[index],
+                                           shadow_depth=int(self.shadow_depths[index]),
+                                           line_width=self.line_widths[index])
+        line._array = self
+
+        return line
+
+    def to_lines(self):
+        """ Get ElementaryLine objects for all lines, points are views of the buffer.
+        """
+        peak_indices = self.peak_indices.tolist()
+        return [self.line(idx, peak_index) for idx, peak_index in enumerate(peak_indices)]
+
+    # -------------------------------------------------------------------------
+    # Magic method to change default behaviours.
+    # -------------------------------------------------------------------------
+
+    def __len__(self):
+        return len(self.energies)
+
+    def __getitem__(self, key):
+        """ Get an ElementaryLine by an integer or a new array by slice or indices,
+        the coordinates of a slice are views of the buffer and changes of them
+        mark this array changed too.
+        """
+        if isinstance(key, (int, np.integer)):
+            if key < 0:
+                key += len(self)
+            return self.line(key)
+
+        x, y = self.points
+        x, y = x[key], y[key]
+        nlines, npts = x.shape
+
+        columns = dict(n=self.n,
+                       interp_method=self.interp_method,
+                       dtype=self.dtype,
+                       energies=self.energies[key],
+                       has_barrier=self.has_barrier[key],
+                       hline_lengths=self.hline_lengths[key],
+                       peak_widths=self.peak_widths[key],
+                       line_widths=self.line_widths[key],
+                       colors=self.colors[key],
+                       shadow_colors=self.shadow_colors[key],
+                       shadow_depths=self.shadow_depths[key],
+                       x=x.reshape(-1),
+                       y=y.reshape(-1),
+                       offsets=np.arange(nlines + 1)*npts)
+
+        if np.may_share_memory(x, self.x):
+            columns["_base"] = self
+
+        return self._from_columns(columns)
+
+    def __iter__(self):
+        """ Make the array iterable as ElementaryLine objects.
+        """
+        return iter(self.to_lines())
+
+    def __getstate__(self):
+        """ Leave the base array out of pickles and copies, the copied
+        coordinates are not views of it.
+        """
+        state = self.__dict__.copy()
+        state.pop("_base", None)
+        return state
@@ -4,7 +4,8 @@
 """ Module for line object in energy profile.
 """
 
-import csv
+import gzip
+import os
 from collections import namedtuple
 
 from matplotlib.lines import Line2D
@@ -12,7 +13,102 @@ from matplotlib import transforms
 import numpy as np
 
 import catplot.descriptors as dc
-from catplot.interpolate import get_potential_energy_points
+from catplot.interpolate import get_potential_energy_points, get_barrier_points
+
+
+# Important points of an elementary energy profile line.
+EigenPts = namedtuple("EigenPts", ["has_barrier", "A", "B", "C", "D", "E"])
+
+
+class EPData(namedtuple("EPData", ["x", "y", "offsets"])):
+    """ Coordinates loaded from a binary energy profile file, points of the
+    i-th line are x[offsets[i]: offsets[i+1]] and y[offsets[i]: offsets[i+1]].
+    """
+    __slots__ = ()
+
+    def lines(self):
+        """ Get (x, y) views for all lines in data.
+        """
+        return [(self.x[start: end], self.y[start: end])
+                for start, end in zip(self.offsets[:-1], self.offsets[1:])]
+
+
+def format_csv_rows(x, y, prefix=""):
+    """ Format points to csv rows, values are written in the shortest repr
+    which keeps full precision, the same with `csv.writer`.
+
+    Parameters:
+    -----------
+    x: 1-D array, x values of points.
+    y: 1-D array, y values of points.
+    prefix: str, optional, leading columns of all rows, default is "".
+    """
+    row = prefix + "{!r},{!r}\r\n"
+    return "".join(row.format(px, py) for px, py in zip(x.tolist(), y.tolist()))
+
+
+def export_ep_data(filename, x, y, offsets=None):
+    """ Export energy profile coordinates to file, the format is determined
+    by the extension of filename.
+
+    Parameters:
+    -----------
+    filename: str, name of the output file,
+        ".npy": a (2, N) array of x and y which can be memory-mapped back,
+        ".npz": arrays x, y and the line offsets,
+        others: csv text file of (x, y) rows, compressed by gzip if
+        the filename ends with ".gz".
+
+    x: 1-D array, x values of points.
+    y: 1-D array, y values of points.
+
+    offsets: 1-D int array, optional
+        boundaries of lines in points, default is one line for all points.
+    """
+    ext = os.path.splitext(filename)[1].lower()
+
+    if ext == ".npy":
+        np.save(filename, np.vstack([x, y]))
+    elif ext == ".npz":
+        if offsets is None:
+            offsets = [0, len(x)]
+        np.savez(filename, x=x, y=y, offsets=np.asarray(offsets, dtype=np.int64))
+    else:
+        opener = gzip.open if filename.endswith(".gz") else open
+        with opener(filename, "wb") as f:
+            f.write(format_csv_rows(np.asarray(x), np.asarray(y)).encode("ascii"))
+
+
+def load_ep_data(filename, mmap_mode=None):
+    """ Load energy profile coordinates exported to a binary file.
+
+    Parameters:
+    -----------
+    filename: str, name of a ".npy" or ".npz" file.
+
+    mmap_mode: str, optional
+        memory-map mode passed to np.load ("r", "r+", "c"), only ".npy"
+        files can be memory-mapped, default is None.
+
+    Returns:
+    --------
+    EPData namedtuple of x, y and offsets.
+    """
+    ext = os.path.splitext(filename)[1].lower()
+
+    if ext == ".npy":
+        data = np.load(filename, mmap_mode=mmap_mode)
+        if data.ndim != 2 or data.shape[0] != 2:
+            raise ValueError("Invalide energy profile data shape {}".format(data.shape))
+        x, y = data
+        offsets = np.array([0, data.shape[1]], dtype=np.int64)
+    elif ext == ".npz":
+        with np.load(filename) as data:
+            x, y, offsets = data["x"], data["y"], data["offsets"]
+    else:
+        raise ValueError("Invalide binary file extension {}".format(ext))
+
+    return EPData(x, y, offsets)
 
 
 class EPLine(object):
@@ -34,8 +130,17 @@ class EPLine(object):
 
     shadow_depth: int, optional
         shadow depth of the line, default is 0, no shadow.
+
+    dtype: data-type, optional
+        data type of x and y values, np.float32 halves the memory of
+        points, default is np.float64.
     """
+    # Version of the line increased whenever its points change, used by
+    # canvas to find the artists and bounds to be updated.
+    _version = 0
+
     def __init__(self, x, y, **kwargs):
+        self.dtype = np.dtype(kwargs.pop("dtype", np.float64))
         self.x = x
         self.y = y
 
@@ -44,6 +149,33 @@ class EPLine(object):
         self.shadow_depth = kwargs.pop("shadow_depth", 0)
         self.line_width = kwargs.pop("line_width", 3)
 
+    @property
+    def x(self):
+        """ x values of points.
+        """
+        return self._x
+
+    @x.setter
+    def x(self, x):
+        self._x = np.asarray(x, dtype=self.dtype)
+        self._touch()
+
+    @property
+    def y(self):
+        """ y values of points.
+        """
+        return self._y
+
+    @y.setter
+    def y(self, y):
+        self._y = np.asarray(y, dtype=self.dtype)
+        self._touch()
+
+    def _touch(self):
+        """ Private helper function to mark the points of line changed.
+        """
+        self._version += 1
+
     def translate(self, distance, direction="x"):
         """ Translate all points in line.
 
@@ -64,6 +196,8 @@ class EPLine(object):
         else:
             raise ValueError("Invalide direction {}".format(direction))
 
+        self._touch()
+
         # Return line itself for the chain operations.
         return self
 
@@ -75,12 +209,28 @@ class EPLine(object):
                       color=self.color)
 
     def export(self, filename):
-        """ Export line data to file.
+        """ Export line data to file, ".npy" and ".npz" files are written in
+        binary format and others in csv format.
+        """
+        export_ep_data(filename, self.x, self.y)
+
+    @staticmethod
+    def load(filename, mmap_mode=None, **kwargs):
+        """ Create an EPLine from a binary file exported by `export`.
+
+        Parameters:
+        -----------
+        filename: str, name of a ".npy" or ".npz" file.
+
+        mmap_mode: str, optional
+            memory-map mode for ".npy" file, the points of line are then
+            views of the mapped file, default is None.
+
+        Other keyword arguments are passed to the constructor.
         """
-        with open(filename, "w") as f:
-            writer = csv.writer(f)
-            for data in zip(self.x, self.y):
-                writer.writerow(data)
+        data = load_ep_data(filename, mmap_mode=mmap_mode)
+        kwargs.setdefault("dtype", data.x.dtype)
+        return EPLine(data.x, data.y, **kwargs)
 
 
 class ElementaryLine(EPLine):
@@ -89,7 +239,8 @@ class ElementaryLine(EPLine):
     Parameters:
     -----------
     energies: tuple or list,
-        energies for states of a elementary reaction.
+        energies for states of a elementary reaction, kept as a tuple
+        of energies relative to IS.
 
     n: int, optional
         the point number in each state, default is 100.
@@ -101,9 +252,24 @@ class ElementaryLine(EPLine):
         the width of the peak in energy profile, default is 1.0.
 
     interp_method: str, optional
-        the type of interpolation algorithm("spline", "quadratic")
+        the type of interpolation algorithm("spline", "quadratic", "hermite"),
+        "hermite" uses monotone cubic Hermite segments without SciPy,
         default is "spline".
 
+    sampling: str, optional
+        the point sampling method("uniform", "adaptive"), "adaptive" puts
+        only end points on IS and FS and at most n points on the barrier
+        according to its curvature, default is "uniform".
+
+    tolerance: float, optional
+        the maximum vertical error of the barrier for "adaptive" sampling,
+        default is 1e-3.
+
+    template: bool, optional
+        get the barrier from cached barrier templates instead of a new
+        spline fitting, see `catplot.interpolate.barrier_template`,
+        default is False.
+
     rxn_equation: str, optional
         elementary reaction equation, default is None.
 
@@ -118,14 +284,38 @@ class ElementaryLine(EPLine):
 
     shadow_depth: int, optional
         shadow depth of the line, default is 0, no shadow.
+
+    dtype: data-type, optional
+        data type of x and y values, default is np.float64.
     """
     # Descriptors.
 
     energies = dc.ElementaryEnergies("energies")
     rxn_equation = dc.ElementaryReaction("rxn_equation")
     interp_method = dc.InterpolationMethod("interp_method")
+    sampling = dc.SamplingMethod("sampling")
+    tolerance = dc.SamplingTolerance("tolerance")
+    template = dc.BarrierTemplate("template")
+
+    # Attributes the interpolated points depend on.
+    _interp_params = ("energies", "n", "hline_length", "peak_width", "interp_method",
+                      "sampling", "tolerance", "template", "dtype")
+
+    # The line array whose buffer the points of line are views of.
+    _array = None
 
     def __init__(self, energies, **kwargs):
+        # Points are interpolated on the first access to x or y, the origin
+        # keeps the translation of the line before that.
+        self._x = None
+        self._y = None
+        self._origin = (0.0, 0.0)
+        self._peak_index = None
+        self._plateau_size = None
+
+        # The chain containing the line.
+        self._chain = None
+
         self.energies = self._get_relative_energies(energies)
 
         # Attributes for basic line.
@@ -133,15 +323,190 @@ class ElementaryLine(EPLine):
         self.hline_length = kwargs.pop("hline_length", 1.0)
         self.peak_width = kwargs.pop("peak_width", 1.0)
         self.interp_method = kwargs.pop("interp_method", "spline")
+        self.sampling = kwargs.pop("sampling", "uniform")
+        self.tolerance = kwargs.pop("tolerance", 1e-3)
+        self.template = kwargs.pop("template", False)
         self.rxn_equation = kwargs.pop("rxn_equation", None)
 
-        # Get x and y lists for the given energies.
+        super(ElementaryLine, self).__init__(None, None, **kwargs)
+
+    @classmethod
+    def _from_points(cls, energies, x, y, **kwargs):
+        """ Private constructor for a line with validated relative energies
+        and interpolated points, no validation or interpolation is done.
+
+        Parameters:
+        -----------
+        energies: list or tuple, relative energies of states.
+        x, y: 1-D arrays with 3n points, kept without copying.
+        peak_index: int, optional, index of the peak in points.
+
+        Others in kwargs are the same with `ElementaryLine()`.
+        """
+        line = cls.__new__(cls)
+        n = kwargs.pop("n", 100)
+        line.__dict__.update(_x=x,
+                             _y=y,
+                             _origin=(0.0, 0.0),
+                             _peak_index=kwargs.pop("peak_index", None),
+                             _plateau_size=n,
+                             _chain=None,
+                             energies=tuple(energies),
+                             n=n,
+                             hline_length=kwargs.pop("hline_length", 1.0),
+                             peak_width=kwargs.pop("peak_width", 1.0),
+                             interp_method=kwargs.pop("interp_method", "spline"),
+                             sampling="uniform",
+                             tolerance=1e-3,
+                             template=False,
+                             rxn_equation=None,
+                             dtype=x.dtype,
+                             color=kwargs.pop("color", "#000000"),
+                             shadow_color=kwargs.pop("shadow_color", "#595959"),
+                             shadow_depth=kwargs.pop("shadow_depth", 0),
+                             line_width=kwargs.pop("line_width", 3))
+        return line
+
+    def __setattr__(self, name, value):
+        """ Drop the interpolated points when the attributes they depend on change.
+        """
+        if name in self._interp_params and self.__dict__.get("_x") is not None:
+            self._drop_points()
+        super(ElementaryLine, self).__setattr__(name, value)
+
+        if name in self._interp_params or name == "rxn_equation":
+            self._touch()
+
+    def __getstate__(self):
+        """ Leave the chain and line array out of pickles and copies, a copied
+        line is not in any chain and does not share points with any array.
+        """
+        state = self.__dict__.copy()
+        state["_chain"] = None
+        state.pop("_array", None)
+        return state
+
+    def _touch(self):
+        """ Private helper function to mark the points of line changed, the
+        line array sharing points with the line is changed too.
+        """
+        super(ElementaryLine, self)._touch()
+        if self._array is not None:
+            self._array._touch()
+
+    def _drop_points(self):
+        """ Private helper function to drop interpolated points but keep the origin.
+        """
+        self._origin = self._get_origin()
+        self._x = None
+        self._y = None
+        self._peak_index = None
+        self._plateau_size = None
+        self._points_replaced()
+
+    def _points_replaced(self):
+        """ Private helper function to tell the chain that the point arrays of
+        line are replaced and no longer views of the chain or array buffer.
+        """
+        self._array = None
+        self._touch()
+        if self._chain is not None:
+            self._chain._invalidate()
+
+    def _get_origin(self):
+        """ Private helper function to get the translation of the line.
+        """
+        if self._x is None:
+            return self._origin
+        return (float(self._x[0]), float(self._y[0]) - self.energies[0])
+
+    def _interpolate(self):
+        """ Private helper function to interpolate points at current origin.
+        """
         x, y = get_potential_energy_points(self.energies,
                                            n=self.n,
                                            hline_length=self.hline_length,
                                            peak_width=self.peak_width,
-                                           kind=self.interp_method)
-        super(ElementaryLine, self).__init__(x, y, **kwargs)
+                                           kind=self.interp_method,
+                                           sampling=self.sampling,
+                                           tolerance=self.tolerance,
+                                           dtype=self.dtype,
+                                           template=self.template)
+        origin_x, origin_y = self._origin
+        x += origin_x
+        y += origin_y
+
+        self._x, self._y = x, y
+        self._plateau_size = self.n if self.sampling == "uniform" else 2
+        self._points_replaced()
+
+        # Locate the peak once for all eigen points queries.
+        if len(self.energies) == 3:
+            self._peak_index = int(np.argmax(y))
+
+    @property
+    def x(self):
+        """ x values of points, interpolated on the first access.
+        """
+        if self._x is None:
+            self._interpolate()
+        return self._x
+
+    @x.setter
+    def x(self, x):
+        if x is None:
+            self._drop_points()
+        else:
+            self._x = np.asarray(x, dtype=self.dtype)
+            self._peak_index = None
+            self._plateau_size = None
+            self._points_replaced()
+
+    @property
+    def y(self):
+        """ y values of points, interpolated on the first access.
+        """
+        if self._y is None:
+            self._interpolate()
+        return self._y
+
+    @y.setter
+    def y(self, y):
+        if y is None:
+            self._drop_points()
+        else:
+            self._y = np.asarray(y, dtype=self.dtype)
+            self._peak_index = None
+            self._plateau_size = None
+            self._points_replaced()
+
+    def translate(self, distance, direction="x"):
+        """ Translate all points in line, only the origin is moved if
+        points are not interpolated yet.
+
+        Parameters:
+        -----------
+        distance: float, translation distance.
+        direction: str, translation direction ("x", "y").
+        """
+        if direction not in ("x", "y"):
+            raise ValueError("Invalide direction {}".format(direction))
+
+        if self._x is None:
+            origin_x, origin_y = self._origin
+            if direction == "x":
+                self._origin = (origin_x + distance, origin_y)
+            else:
+                self._origin = (origin_x, origin_y + distance)
+        elif direction == "x":
+            self._x += distance
+        else:
+            self._y += distance
+
+        self._touch()
+
+        # Return line itself for the chain operations.
+        return self
 
     def _get_relative_energies(self, energies):
         """ Translate the energy tuple to origin.
@@ -177,10 +542,16 @@ class ElementaryLine(EPLine):
         A_/    D                            A_/
            B                                   B
 
-        Get coordinates of points A, B, C, D, E.
+        Get coordinates of points A, B, C, D, E, the index of the peak is
+        cached with the interpolated points so the query costs O(1).
         """
         # Coordinate for point A.
-        ca = (self.x[0], self.y[0])
+        if self._x is None and len(self.energies) == 2:
+            # No need to interpolate points for a line without barrier.
+            origin_x, origin_y = self._origin
+            ca = (origin_x, origin_y + self.energies[0])
+        else:
+            ca = (self.x[0], self.y[0])
 
         # B
         cb = (ca[0] + self.hline_length, ca[1])
@@ -190,10 +561,8 @@ class ElementaryLine(EPLine):
 
         # C, the peak.
         if len(self.energies) == 3:
-            y = np.max(self.y)
-            idx = self.y.tolist().index(y)
-            x = self.x[idx]
-            cc = (x, y)
+            idx = self._get_peak_index()
+            cc = (self._x[idx], self._y[idx])
             has_barrier = True
         else:
             cc = cd
@@ -202,40 +571,86 @@ class ElementaryLine(EPLine):
         # E
         ce = (cd[0] + self.hline_length, cd[1])
 
-        # Define a namedtuple for eigen points here.
-        EigenPts = namedtuple("EigenPts", ["has_barrier", "A", "B", "C", "D", "E"])
+        return EigenPts(has_barrier, ca, cb, cc, cd, ce)
 
-        return EigenPts._make([has_barrier, ca, cb, cc, cd, ce])
+    def _get_peak_index(self):
+        """ Private helper function to get the index of the peak in points,
+        which is kept along with the points and unchanged by translation.
+        """
+        if self._peak_index is None:
+            self._peak_index = int(np.argmax(self.y))
+        return self._peak_index
 
     def translate_state(self, state, distance):
         """ Translate a specific state in an elementary energy profile.
 
+        Only the barrier is interpolated again, the plateaus of IS and FS are
+        shifted in place. If the line is in a chain, all lines after it are
+        translated along with the FS.
+
         state: str, state name ("IS", "TS", "FS")
 
         distance: float, translation distance along Y axis.
         """
+        states = ["IS", "TS", "FS"] if len(self.energies) == 3 else ["IS", "FS"]
         try:
-            idx = ["IS", "TS", "FS"].index(state)
+            idx = states.index(state)
         except ValueError:
             raise ValueError("Invalid state name \"{}\"".format(state))
 
-        # Get a new energy list.
-        self.energies[idx] += distance
-
-        # Create a new line.
-        line = ElementaryLine(self.energies)
+        # Keep the energies relative to IS.
+        energies = list(self.energies)
+        energies[idx] += distance
+        if idx == 0:
+            energies = [e - distance for e in energies]
 
-        # Original start point.
-        x, y = self.eigen_points.A
+        if self._x is None or self._plateau_size is None:
+            # The points will be interpolated again with the new energies.
+            self.energies = energies
+            if idx == 0:
+                self.translate(distance, "y")
+        else:
+            # Set energies without dropping the points.
+            object.__setattr__(self, "energies", energies)
+            self._update_barrier(distance if idx == 0 else 0.0,
+                                 distance if idx == len(energies) - 1 else 0.0)
 
-        # Coincide the start points for the original and new.
-        line.translate(y, "y")
+        # Lines after this one follow the FS.
+        if idx == len(energies) - 1 and self._chain is not None:
+            self._chain._propagate(self, distance)
 
-        # If the translated state is IS, extral operation must be done.
-        if idx == 0:
-            line.translate(distance, "y")
+        return self
 
-        # Update the original line data.
-        self.x = line.x
-        self.y = line.y
+    def _update_barrier(self, is_distance, fs_distance):
+        """ Private helper function to interpolate the barrier again and
+        shift the plateaus of IS and FS.
+        """
+        m = self._plateau_size
+        start_x, start_y = self._x[0], self._y[0] + is_distance
+
+        x_b, y_b = get_barrier_points(self.energies,
+                                      n=self.n,
+                                      peak_width=self.peak_width,
+                                      kind=self.interp_method,
+                                      sampling=self.sampling,
+                                      tolerance=self.tolerance,
+                                      template=self.template)
+        x_b += start_x + self.hline_length
+        y_b += start_y - self.energies[0]
+
+        if len(x_b) == len(self._x) - 2*m:
+            # Update points in place.
+            self._y[:m] += is_distance
+            self._x[m:-m] = x_b
+            self._y[m:-m] = y_b
+            self._y[-m:] += fs_distance
+            self._touch()
+        else:
+            # The number of adaptive points changes.
+            self._x = np.concatenate([self._x[:m], x_b, self._x[-m:]]).astype(self.dtype)
+            self._y = np.concatenate([self._y[:m] + is_distance, y_b,
+                                      self._y[-m:] + fs_distance]).astype(self.dtype)
+            self._points_replaced()
 
+        if len(self.energies) == 3:
+            self._peak_index = m + int(np.argmax(y_b))
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Module for list of energy profile items indexed by identity.
+"""
+
+
+class ItemList(list):
+    """ List keeping the positions of items by their identities, so the
+    membership test and position query cost O(1).
+
+    The positions are indexed again when the list is changed in place by the
+    list API, e.g. `chain.elementary_lines.remove(line)`, and the optional
+    callback is then called without arguments.
+
+    Parameters:
+    -----------
+    items: iterable, optional, items in list.
+
+    on_change: callable, optional
+        function called after the list is changed in place, default is None.
+    """
+    on_change = None
+
+    def __init__(self, items=(), on_change=None):
+        super(ItemList, self).__init__(items)
+        self.on_change = on_change
+        self._index()
+
+    def _index(self):
+        """ Private helper function to index positions of all items, the
+        dict is updated in place so references to it stay valid.
+        """
+        positions = self.__dict__.setdefault("positions", {})
+        positions.clear()
+        positions.update((id(item), idx) for idx, item in enumerate(self))
+
+    def _changed(self):
+        """ Private helper function called after the list is changed in place.
+        """
+        self._index()
+        if self.on_change is not None:
+            self.on_change()
+
+    def add(self, items):
+        """ Add items to the end of list without indexing all items again
+        or calling the callback.
+        """
+        items = list(items)
+        start = len(self)
+        super(ItemList, self).extend(items)
+        self.positions.update((id(item), start + idx) for idx, item in enumerate(items))
+
+    def position(self, item):
+        """ Get the position of an item, None if the item is not in list.
+        """
+        idx = self.positions.get(id(item))
+        if idx is not None and self[idx] is item:
+            return idx
+        return None
+
+    def __contains__(self, item):
+        return self.position(item) is not None
+
+    def __reduce__(self):
+        """ Index items again in pickles and copies instead of keeping
+        the positions of original items.
+        """
+        return (self.__class__, (list(self), self.on_change))
+
+    def __reduce_ex__(self, protocol):
+        return self.__reduce__()
+
+
+def _changing(name):
+    """ Wrap a list method changing the list in place to index items again.
+    """
+    method = getattr(list, name)
+
+    def wrapper(self, *args):
+        result = method(self, *args)
+        self._changed()
+        return result
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+for _name in ("append", "extend", "insert", "remove", "pop", "clear",
+              "sort", "reverse", "__setitem__", "__delitem__", "__iadd__",
+              "__imul__", "__setslice__", "__delslice__"):
+    if hasattr(list, _name):
+        setattr(ItemList, _name, _changing(_name))
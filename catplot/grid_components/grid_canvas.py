@@ -129,20 +129,24 @@ class Grid2DCanvas(Canvas):
             y = np.concatenate([arrow.y for arrow in self.arrows])
             return np.array(list(zip(x, y)))
 
+    def _get_bounding_points(self, ndim=2):
+        """ Private helper function to get the points whose bounding box is
+        the same as that of all nodes, edges and arrows with shape (N, ndim),
+        edges are straight lines so only their endpoints are needed.
+        """
+        points = [node.coordinate for node in self.nodes]
+        for edge in self.edges + self.arrows:
+            points.append(edge.start)
+            points.append(edge.end)
+
+        return np.array(points, dtype=float).reshape(-1, ndim)
+
     def _get_data_limits(self):
         """ Private helper function to get the limits of data.
         """
-        node_x = self.node_coordinates[:, 0] if self.nodes else []
-        edge_x = self.edge_coordinates[:, 0] if self.edges else []
-        arrow_x = self.arrow_coordinates[:, 0] if self.arrows else []
-        x = np.concatenate([node_x, edge_x, arrow_x])
-        max_x, min_x = np.max(x), np.min(x)
-
-        node_y = self.node_coordinates[:, 1] if self.nodes else []
-        edge_y = self.edge_coordinates[:, 1] if self.edges else []
-        arrow_y = self.arrow_coordinates[:, 1] if self.arrows else []
-        y = np.concatenate([node_y, edge_y, arrow_y])
-        max_y, min_y = np.max(y), np.min(y)
+        points = self._get_bounding_points()
+        max_x, max_y = np.max(points, axis=0)
+        min_x, min_y = np.min(points, axis=0)
 
         return self._limits(max_x, min_x, max_y, min_y)
 
@@ -303,26 +307,15 @@ class Grid3DCanvas(Grid2DCanvas):
     def _get_data_limits(self):
         """ Get limits for all data in canvas.
         """
-        node_x = self.node_coordinates[:, 0] if self.nodes else []
-        edge_x = self.edge_coordinates[:, 0] if self.edges else []
-        plane_x = (np.concatenate([np.concatenate(plane.x) for plane in self.planes])
-                   if self.planes else [])
-        x = np.concatenate([node_x, edge_x, plane_x])
-        max_x, min_x = np.max(x), np.min(x)
-
-        node_y = self.node_coordinates[:, 1] if self.nodes else []
-        edge_y = self.edge_coordinates[:, 1] if self.edges else []
-        plane_y = (np.concatenate([np.concatenate(plane.y) for plane in self.planes])
-                   if self.planes else [])
-        y = np.concatenate([node_y, edge_y, plane_y])
-        max_y, min_y = np.max(y), np.min(y)
-
-        node_z = self.node_coordinates[:, 2] if self.nodes else []
-        edge_z = self.edge_coordinates[:, 2] if self.edges else []
-        plane_z = (np.concatenate([np.concatenate(plane.z) for plane in self.planes])
-                   if self.planes else [])
-        z = np.concatenate([node_z, edge_z, plane_z])
-        max_z, min_z = np.max(z), np.min(z)
+        points = [self._get_bounding_points(ndim=3)]
+        for plane in self.planes:
+            points.append(np.column_stack([np.ravel(plane.x),
+                                           np.ravel(plane.y),
+                                           np.ravel(plane.z)]))
+        points = np.concatenate(points)
+
+        max_x, max_y, max_z = np.max(points, axis=0)
+        min_x, min_y, min_z = np.min(points, axis=0)
 
         return self._limits(max_x, min_x, max_y, min_y, max_z, min_z)
 
@@ -4,10 +4,63 @@
 """ Module for interpolation algorithm implementation for energy profile plotting.
 """
 
-from math import sqrt
+from collections import OrderedDict, namedtuple
 
 import numpy as np
-from scipy import interpolate
+
+
+def _scipy_interpolate():
+    """
+    Import scipy.interpolate lazily, only the 'spline' and 'quadratic' kinds need it.
+    """
+    from scipy import interpolate
+    return interpolate
+
+
+def quadratic_connect_coefficients(x1, y1, x2, y2):
+    # {{{
+    """
+    Solve the coefficients of quadratic functions(y = ax^2 + bx + c) connecting
+    points (x1, y1) and (x2, y2) with zero slope at (x2, y2).
+
+    The linear equations
+
+        a*x1^2 + b*x1 + c = y1
+        a*x2^2 + b*x2 + c = y2
+              2*a*x2 + b  = 0
+
+    have the closed-form solution
+
+        a = (y1 - y2)/(x1 - x2)^2, b = -2*a*x2, c = y2 + a*x2^2
+
+    so any number of segments can be solved at once.
+
+    Parameters
+    ----------
+    x1, y1 : float or array like
+        x and y values of the first points.
+    x2, y2 : float or array like
+        x and y values of the second points.
+
+    Return:
+    -------
+    (a, b, c), three float64 arrays broadcast from the parameters.
+
+    Examples
+    --------
+    >>> a, b, c = quadratic_connect_coefficients([0.0, 0.0], [0.0, 1.0], [2.0, 1.0], [2.0, 0.0])
+    >>> a, b, c
+    (array([-0.5,  1. ]), array([ 2., -2.]), array([0., 1.]))
+
+    """
+    x1, y1, x2, y2 = [np.asarray(v, dtype=np.float64) for v in (x1, y1, x2, y2)]
+
+    a = (y1 - y2)/(x1 - x2)**2
+    b = -2*a*x2
+    c = y2 + a*x2**2
+
+    return a, b, c
+    # }}}
 
 
 def quadratic_connect_interp(x1, y1, x2, y2):
@@ -42,18 +95,12 @@ def quadratic_connect_interp(x1, y1, x2, y2):
 
     Examples
     --------
-    >>> f = m.plotter.quadratic_interp_poly(0.0, 0.0, 2.0, 2.0)
-    >>> <function kinetic.plotters.general_plotter.poly_func>
+    >>> f = quadratic_connect_interp(0.0, 0.0, 2.0, 2.0)
+    >>> f(1.0)
+    1.5
 
     """
-    A = np.matrix([[x1**2, x1, 1],
-                   [x2**2, x2, 1],
-                   [2*x2, 1, 0]])
-
-    b = np.matrix([[y1], [y2], [0]])
-    x = A.I * b
-    x.shape = (1, -1)
-    a, b, c = x.tolist()[0]
+    a, b, c = [float(coeff) for coeff in quadratic_connect_coefficients(x1, y1, x2, y2)]
 
     poly_func = lambda x: a*x**2 + b*x + c
 
@@ -95,23 +142,13 @@ def quadratic_interp(x1, y1, x3, y3, y2):
     -------
     (x value of second point, quadratic function object)
     """
-    k = (y3 - y2)/(y1 - y2)
-    a = k - 1
-    b = 2*x3 - 2*k*x1
-    c = k*x1**2 - x3**2
-
-    roots = [
-        (-b + sqrt(b**2 - 4*a*c)) / (2*a),
-        (-b - sqrt(b**2 - 4*a*c)) / (2*a),
-    ]
-    # get root between x1 and x3
-    root = [x for x in roots if min(x1, x3) <= x <= max(x1, x3)]
-    if len(root) == 0:
+    x2, m, valid = quadratic_interp_coefficients(x1, y1, x3, y3, y2)
+    if not valid:
         raise ValueError('No real root.')
-    else:
-        n = x2 = root[0]
+
     # y = m*(x - n)**2 + l
-    m = (y1 - y2) / ((x1 - x2)**2)
+    n = x2 = float(x2)
+    m = float(m)
     l = y2
     func = lambda x: m*(x - n)**2 + l
 
@@ -119,6 +156,56 @@ def quadratic_interp(x1, y1, x3, y3, y2):
     # }}}
 
 
+def quadratic_interp_coefficients(x1, y1, x3, y3, y2):
+    # {{{
+    """
+    Vectorized version of `quadratic_interp` for any number of barriers,
+    find the x value of second point and the coefficient of quadratic function
+         y = m*(x - x2)**2 + y2
+
+    Parameters:
+    -----------
+    x1, y1 : float or array like
+        x and y values of the first points(A).
+    x3, y3 : float or array like
+        x and y values of the third points(C).
+    y2: float or array like
+        the y values of the second points(B).
+
+    Return:
+    -------
+    (x values of second points, coefficients m, valid mask), three arrays
+    broadcast from the parameters. The entries without real root between
+    x1 and x3 are marked False in valid mask and filled with NaN.
+    """
+    x1, y1, x3, y3, y2 = [np.asarray(v, dtype=np.float64) for v in (x1, y1, x3, y3, y2)]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        k = (y3 - y2)/(y1 - y2)
+        a = k - 1
+        b = 2*x3 - 2*k*x1
+        c = k*x1**2 - x3**2
+
+        # Roots of a*x^2 + b*x + c = 0, NaN for complex ones.
+        delta = b**2 - 4*a*c
+        sqrt_delta = np.sqrt(np.where(delta >= 0.0, delta, np.nan))
+        linear = (a == 0.0)
+        a = np.where(linear, np.nan, a)
+        root1 = np.where(linear, -c/b, (-b + sqrt_delta)/(2*a))
+        root2 = np.where(linear, -c/b, (-b - sqrt_delta)/(2*a))
+
+        # get root between x1 and x3
+        lower, upper = np.minimum(x1, x3), np.maximum(x1, x3)
+        valid1 = (lower <= root1) & (root1 <= upper)
+        valid2 = (lower <= root2) & (root2 <= upper)
+        x2 = np.where(valid1, root1, np.where(valid2, root2, np.nan))
+
+        m = (y1 - y2)/((x1 - x2)**2)
+
+    return x2, m, valid1 | valid2
+    # }}}
+
+
 def spline_interp(x1, y1, x3, y3, y2, x2_ratio=0.5):
     # {{{
     r"""
@@ -153,7 +240,7 @@ def spline_interp(x1, y1, x3, y3, y2, x2_ratio=0.5):
 
     Return:
     -------
-    (x value of second point, quadratic function object)
+    (x value of second point, spline function object accepting arrays)
 
     """
     if not 0.0 < x2_ratio < 1.0:
@@ -161,37 +248,223 @@ def spline_interp(x1, y1, x3, y3, y2, x2_ratio=0.5):
 
     x2 = (x1 + x3)*x2_ratio
 
-    # Collect all points to be interpolated.
-    x, y = [], []
-
     # Insert temporary point.
     # The first half.
     quad_func = quadratic_connect_interp(x1, y1, x2, y2)
-    quad_func = np.frompyfunc(quad_func, 1, 1)
     insert_x1 = np.linspace(x1, x2, 5)
     insert_y1 = quad_func(insert_x1)
-    x = np.append(x, insert_x1)
-    y = np.append(y, insert_y1)
 
     # The second half.
     quad_func = quadratic_connect_interp(x3, y3, x2, y2)
-    quad_func = np.frompyfunc(quad_func, 1, 1)
     insert_x2 = np.linspace(x2 + 0.1, x3, 5)
     insert_y2 = quad_func(insert_x2)
-    x = np.append(x, insert_x2)
-    y = np.append(y, insert_y2)
 
-    func = interpolate.UnivariateSpline(x, y, s=0)
+    # Collect all points to be interpolated.
+    x = np.concatenate([insert_x1, insert_x2])
+    y = np.concatenate([insert_y1, insert_y2])
+
+    func = _scipy_interpolate().UnivariateSpline(x, y, s=0)
 
     return x2, func
     # }}}
 
 
+def _smoothstep(t):
+    """
+    Cubic Hermite basis rising from 0 to 1 on [0, 1] with zero end slopes.
+    """
+    return t*t*(3.0 - 2.0*t)
+
+
+def hermite_interp(x1, y1, x3, y3, y2, x2_ratio=0.5):
+    # {{{
+    r"""
+    Use monotone cubic Hermite segments to interpolate three given points,
+    the slopes at all points are zero, so the curve is monotone between
+    points and joins the horizontal lines of IS and FS smoothly. Only NumPy
+    is needed.
+
+    ---------------------------------------
+
+    A = (x1, y1)
+    B = (x2, y2) = ( (x1 + x3)*x2_ratio )
+    C = (x3, y3)
+
+       B                            B
+       _                            _
+          C                        / \ C
+          _        -->            /   \_
+    A              -->         A /
+    _                          _/
+
+    --------------------------------------
+
+    Parameters:
+    -----------
+    x1, y1 : float
+        x and y value of the first point(A).
+    x3, y3 : float
+        x and y value of the third point(C).
+    y2: float
+        the y value of the second point(B).
+    x2_ratio: float (0 ~ 1)
+        define the horizontal position of the second point(B),
+        x2 = (x1 + x3)*x2_ratio
+
+    Return:
+    -------
+    (x value of second point, Hermite function object accepting arrays)
+    """
+    if not 0.0 < x2_ratio < 1.0:
+        raise ValueError("Invalide x2 ratio({}) which should be in (0 ~ 1)".format(x2_ratio))
+
+    x2 = (x1 + x3)*x2_ratio
+
+    def func(x):
+        x = np.asarray(x, dtype=np.float64)
+        first = y1 + (y2 - y1)*_smoothstep(np.clip((x - x1)/(x2 - x1), 0.0, 1.0))
+        second = y2 + (y3 - y2)*_smoothstep(np.clip((x - x2)/(x3 - x2), 0.0, 1.0))
+        return np.where(x <= x2, first, second)
+
+    return x2, func
+    # }}}
+
+
+def _barrierless_interp(y1, y3, peak_width, kind):
+    """
+    Private helper function to get the function connecting IS and FS
+    of an elementary line without barrier.
+    """
+    if kind == "hermite":
+        return lambda x: y1 + (y3 - y1)*_smoothstep(np.asarray(x)/peak_width)
+
+    #transition state
+    if y1 < y3:
+        init_x_b = np.array([0.0, peak_width - 1e-5, peak_width])
+        init_y_b = np.array([y1, y3+1e-100, y3])
+    else:
+        init_x_b = np.array([0.0, 1e-5, peak_width])
+        init_y_b = np.array([y1, y1+1e-100, y3])
+
+    return _scipy_interpolate().interp1d(init_x_b, init_y_b, kind='quadratic')
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class ProfileCache(object):
+    """ Size-bounded least recently used cache for interpolated profile points.
+
+    Parameters:
+    -----------
+    maxsize: int, optional
+        the maximum number of profiles kept in cache, default is 1024.
+    """
+    def __init__(self, maxsize=1024):
+        if maxsize <= 0:
+            raise ValueError("maxsize of cache must be a positive integer")
+
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._profiles = OrderedDict()
+
+    def get(self, key):
+        """ Get the cached value of the key, return None if it is not cached.
+        """
+        try:
+            value = self._profiles.pop(key)
+        except KeyError:
+            self.misses += 1
+            return None
+
+        # Mark it as the most recently used one.
+        self._profiles[key] = value
+        self.hits += 1
+
+        return value
+
+    def put(self, key, value):
+        """ Put a value into cache and discard the least recently used ones.
+        """
+        self._profiles.pop(key, None)
+        self._profiles[key] = value
+
+        while len(self._profiles) > self.maxsize:
+            self._profiles.popitem(last=False)
+
+    def clear(self):
+        """ Clear all cached values and the statistics.
+        """
+        self._profiles.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        """ Get statistics of the cache.
+        """
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._profiles))
+
+    def __len__(self):
+        return len(self._profiles)
+
+
+# The profile cache used by `get_potential_energy_points`, disabled by default.
+_profile_cache = None
+
+
+def enable_profile_cache(maxsize=1024):
+    """
+    Cache the points returned by `get_potential_energy_points` for repeated
+    (energies, n, hline_length, peak_width, kind, sampling, tolerance) combinations.
+
+    Parameters:
+    -----------
+    maxsize: int, optional
+        the maximum number of profiles kept in cache, default is 1024.
+    """
+    global _profile_cache
+    _profile_cache = ProfileCache(maxsize)
+
+
+def disable_profile_cache():
+    """
+    Disable and drop the profile cache.
+    """
+    global _profile_cache
+    _profile_cache = None
+
+
+def clear_profile_cache():
+    """
+    Clear the cached profiles and the statistics of profile cache.
+    """
+    if _profile_cache is not None:
+        _profile_cache.clear()
+
+
+def profile_cache_info():
+    """
+    Get the statistics of profile cache.
+
+    Return:
+    -------
+    CacheInfo(hits, misses, maxsize, currsize), None if cache is disabled.
+    """
+    if _profile_cache is None:
+        return None
+    return _profile_cache.info()
+
+
 def get_potential_energy_points(energies,
                                 n=100,
                                 hline_length=1.0,
                                 peak_width=1.0,
-                                kind="spline"):
+                                kind="spline",
+                                sampling="uniform",
+                                tolerance=1e-3,
+                                dtype=np.float64,
+                                template=False):
     # {{{
     """
     Get all points for a reaction process containing IS, TS, FS.
@@ -206,80 +479,485 @@ def get_potential_energy_points(energies,
         Length of the horizontal line for the IS & FS.
     peak_width : float, default to be 1.0
     kind: str, optional
-        Specifies the kind of interpolation as a string ('quadratic', 'spline').
-        Default is 'spline'.
+        Specifies the kind of interpolation as a string ('quadratic', 'spline',
+        'hermite'), 'hermite' is free of SciPy. Default is 'spline'.
+    sampling: str, optional
+        Specifies how points are sampled ('uniform', 'adaptive').
+        'uniform' puts n points on each of IS, barrier and FS.
+        'adaptive' puts only end points on the flat IS and FS and at most n
+        points on barrier in proportion to its curvature.
+        Default is 'uniform'.
+    tolerance: float, optional
+        The maximum vertical error of straight segments between the points
+        of barrier for 'adaptive' sampling, default is 1e-3.
+    dtype: data-type, optional
+        The data type of returned points, e.g. np.float32 to save memory
+        for plotting, default is np.float64.
+    template: bool, optional
+        Get the barrier from cached barrier templates (see `barrier_template`)
+        instead of fitting a new spline, only available for 'uniform'
+        sampling and barriers without 'quadratic' kind. Default is False.
 
     Return:
     -------
-    (points for x, points for y), two 1-D arrays.
+    (points for x, points for y), two 1-D arrays of dtype.
+
+    Note:
+    -----
+    The interpolation functions are evaluated on whole arrays at once, the
+    results agree with the former point-by-point (np.frompyfunc) evaluation
+    within floating point rounding (absolute tolerance 1e-12).
+
+    If the profile cache is enabled by `enable_profile_cache`, points of
+    repeated parameters are copied from cache instead of interpolation.
     """
-    if kind == "spline":
-        interp_func = spline_interp
-    elif kind == "quadratic":
-        interp_func = quadratic_interp
+    if _profile_cache is None:
+        x, y = _interp_potential_energy_points(energies, n, hline_length, peak_width,
+                                               kind, sampling, tolerance, template)
+        return x.astype(dtype, copy=False), y.astype(dtype, copy=False)
+
+    key = (tuple(float(e) for e in energies), n,
+           float(hline_length), float(peak_width), kind, sampling, float(tolerance),
+           bool(template))
+
+    points = _profile_cache.get(key)
+    if points is None:
+        points = _interp_potential_energy_points(energies, n, hline_length, peak_width,
+                                                 kind, sampling, tolerance, template)
+        for array in points:
+            array.flags.writeable = False
+        _profile_cache.put(key, points)
+
+    # Lines are translated in place, so never share cached arrays.
+    x, y = points
+
+    return x.astype(dtype), y.astype(dtype)
+    # }}}
+
+
+def _interp_potential_energy_points(energies, n, hline_length, peak_width,
+                                    kind, sampling, tolerance, template):
+    # {{{
+    """
+    Private helper function to interpolate points for a reaction process,
+    see `get_potential_energy_points`.
+    """
+    x_b, y_b = get_barrier_points(energies, n, peak_width, kind,
+                                  sampling, tolerance, template)
+    y1, y3 = energies[0], energies[-1]
+
+    if sampling == "uniform":
+        # initial state
+        x_i = np.linspace(0, hline_length, n)
+        y_i = np.linspace(y1, y1, n)
+
+        # final state
+        x_f = np.linspace(hline_length + peak_width,
+                          2*hline_length + peak_width, n)
+        y_f = np.linspace(y3, y3, n)
     else:
+        # Only end points for the flat IS and FS.
+        x_i = np.array([0.0, hline_length])
+        y_i = np.array([y1, y1], dtype=np.float64)
+
+        x_f = np.array([hline_length + peak_width, 2*hline_length + peak_width])
+        y_f = np.array([y3, y3], dtype=np.float64)
+
+    x_b = x_b + hline_length     # translation
+
+    # Combine all points
+    x = np.concatenate([x_i, x_b, x_f])
+    y = np.concatenate([y_i, y_b, y_f])
+
+    return x, y
+    # }}}
+
+
+def get_barrier_points(energies,
+                       n=100,
+                       peak_width=1.0,
+                       kind="spline",
+                       sampling="uniform",
+                       tolerance=1e-3,
+                       template=False):
+    # {{{
+    """
+    Get points of the barrier between IS and FS only, x values start from 0.
+
+    Parameters are the same with `get_potential_energy_points`.
+
+    Return:
+    -------
+    (points for x, points for y), two 1-D float64 arrays.
+    """
+    if sampling not in ("uniform", "adaptive"):
+        raise ValueError(("Invalide sampling method({}) which should be" +
+                          "in ('uniform', 'adaptive')").format(sampling))
+
+    interp_funcs = {"spline": spline_interp,
+                    "quadratic": quadratic_interp,
+                    "hermite": hermite_interp}
+    if kind not in interp_funcs:
         raise ValueError(("Invalide interpolation kind({}) which should be" +
-                          "in ('quadiatic', 'spline')").format(kind))
+                          "in ('quadiatic', 'spline', 'hermite')").format(kind))
+    interp_func = interp_funcs[kind]
 
-    # Use interpolation method to get barrier point.
+    if template:
+        if sampling != "uniform":
+            raise ValueError("barrier templates only support uniform sampling")
+        if kind == "quadratic" and len(energies) == 3:
+            raise ValueError("barrier templates are not available for quadratic barriers")
+
+        energies = np.asarray(energies, dtype=np.float64)
+        if len(energies) == 3 and not (energies[1] > max(energies[0], energies[2])):
+            raise ValueError('abnormal energy : ' + str(energies))
+
+        # Lines without barrier are the same for 'spline' and 'quadratic'.
+        template_kind = "hermite" if kind == "hermite" else "spline"
+        template = barrier_template(peak_width, n, len(energies),
+                                    energies[0] < energies[-1], template_kind)
+        return np.linspace(0, peak_width, n), template.dot(energies)
+
+    # Use interpolation method to get barrier function.
     if len(energies) == 3:
         y1, y2, y3 = energies  # E_is, E_ts, E_fs
         # check energy tuple
         if not (y2 > max(y1, y3)):
             raise ValueError('abnormal energy : ' + str(energies))
         # get x2
-        x2, f = interp_func(0.0, y1, peak_width, y3, y2)
-        init_x_b = np.linspace(0, peak_width, n)
-        f_ufunc = np.frompyfunc(f, 1, 1)  # convert to universal function
-        y_b = f_ufunc(init_x_b)
-        x_b = init_x_b + hline_length     # translation
+        x2, f_b = interp_func(0.0, y1, peak_width, y3, y2)
 
-        # initial state y
-        x_i = np.linspace(0, hline_length, n)
-        y_i = np.linspace(y1, y1, n)
+    if len(energies) == 2:
+        y1, y3 = energies
+        f_b = _barrierless_interp(y1, y3, peak_width, kind)
 
-        # final state y
-        x_f = np.linspace(hline_length+peak_width,
-                          2*hline_length+peak_width, n)
-        y_f = np.linspace(y3, y3, n)
-        # Combine all points
-        y = np.concatenate([y_i, y_b, y_f])
-        #x = np.linspace(0, x3 + 2*hline_length, 3*n)
-        x = np.concatenate([x_i, x_b, x_f])
+    if sampling == "uniform":
+        # All kinds return functions working on whole arrays.
+        x_b = np.linspace(0, peak_width, n)
+        y_b = np.asarray(f_b(x_b), dtype=np.float64)
+    else:
+        x_b, y_b = _adaptive_points(f_b, peak_width, n, tolerance)
 
-    if len(energies) == 2:
-        #transition state
-        energy_list = list(energies)
-        if energy_list[0] < energy_list[-1]:
-            energy_list.insert(1, energies[-1]+1e-100)
-            init_x_b = np.array([0.0, peak_width - 1e-5, peak_width])
+    return x_b, y_b
+    # }}}
+
+
+def _adaptive_points(func, width, n, tolerance):
+    # {{{
+    """
+    Private helper function to sample a barrier function with point density
+    in proportion to the square root of its curvature.
+
+    For a segment with length h, the error of linear interpolation is about
+    h^2*|f''|/8, so the number of segments needed to keep the error below
+    tolerance is the integral of sqrt(|f''|/(8*tolerance)). A safety factor
+    of 2 is applied to the error estimate of the discrete curvature.
+
+    Parameters:
+    -----------
+    func: function, the barrier function working on arrays.
+    width: float, the width of barrier.
+    n: int, the resolution of curvature estimation and the maximum point number,
+       at least 3 points are returned.
+    tolerance: float, the maximum vertical error of linear interpolation.
+
+    Return:
+    -------
+    (points for x, points for y), two 1-D float64 arrays.
+    """
+    if tolerance <= 0.0:
+        raise ValueError("tolerance must be positive")
+
+    # Estimate curvature on a uniform grid.
+    x = np.linspace(0, width, max(n, 3))
+    y = np.asarray(func(x), dtype=np.float64)
+    curvature = np.abs(np.gradient(np.gradient(y, x), x))
+    density = np.sqrt(curvature/(4*tolerance))
+
+    # Cumulative number of segments along x.
+    nsegments = np.concatenate([[0.0], np.cumsum((density[1:] + density[:-1])*np.diff(x)/2)])
+    # The highest point may be added to the end points of segments.
+    total = int(np.clip(np.ceil(nsegments[-1]), 1, max(n - 2, 1)))
+
+    # Distribute points evenly in the cumulative segment number.
+    if nsegments[-1] > 0.0:
+        sample_x = np.interp(np.linspace(0, nsegments[-1], total + 1), nsegments, x)
+    else:
+        sample_x = np.linspace(0, width, total + 1)
+
+    # Keep the highest point, the end points are already exact.
+    sample_x = np.concatenate([sample_x, [x[np.argmax(y)]]])
+    sample_x = np.unique(sample_x)
+
+    return sample_x, np.asarray(func(sample_x), dtype=np.float64)
+    # }}}
+
+
+def _barrier_basis(peak_width, n, kind):
+    # {{{
+    """
+    Private helper function to get the barrier points of unit energies.
+
+    The barrier is linear in (E_IS, E_TS, E_FS) for a fixed peak width,
+    so the barrier of any energy tuple is a linear combination of the columns.
+
+    Return:
+    -------
+    2-D array with shape (n, 3).
+    """
+    interp_func = hermite_interp if kind == "hermite" else spline_interp
+
+    x = np.linspace(0, peak_width, n)
+    basis = np.empty((n, 3))
+
+    for col, (y1, y2, y3) in enumerate(np.eye(3)):
+        _, f = interp_func(0.0, y1, peak_width, y3, y2)
+        basis[:, col] = f(x)
+
+    return basis
+    # }}}
+
+
+def _step_basis(peak_width, n, ascending, kind):
+    # {{{
+    """
+    Private helper function to get the points of unit energies for
+    an elementary line without barrier, see `_barrier_basis`.
+
+    Return:
+    -------
+    2-D array with shape (n, 2).
+    """
+    x = np.linspace(0, peak_width, n)
+
+    if kind == "hermite":
+        step = _smoothstep(x/peak_width)
+        return np.column_stack([1.0 - step, step])
+
+    if ascending:
+        init_x_b = np.array([0.0, peak_width - 1e-5, peak_width])
+        init_y_b = np.array([[1.0, 0.0, 0.0], [0.0, 1.0, 1.0]])
+    else:
+        init_x_b = np.array([0.0, 1e-5, peak_width])
+        init_y_b = np.array([[1.0, 1.0, 0.0], [0.0, 0.0, 1.0]])
+
+    basis = np.empty((n, 2))
+
+    for col, y in enumerate(init_y_b):
+        f = _scipy_interpolate().interp1d(init_x_b, y, kind="quadratic")
+        basis[:, col] = f(x)
+
+    return basis
+    # }}}
+
+
+# Cache for barrier templates.
+_template_cache = ProfileCache(maxsize=256)
+
+
+def barrier_template(peak_width, n, nstates=3, ascending=True, kind="spline"):
+    # {{{
+    """
+    Get the normalized barrier template for given peak width and point number.
+
+    The barrier between states is a linear function of the state energies
+    (the spline fitted with fixed knots and the quadratic connection of the
+    line without barrier), so the barrier of any energies is just an affine
+    combination of the template columns:
+
+        y_b = E_IS*template[:, 0] + E_TS*template[:, 1] + E_FS*template[:, 2]
+
+    Templates are exact (not approximated) and cached for each parameter set.
+
+    Parameters:
+    -----------
+    peak_width: float, the width of the peak.
+    n: int, the number of points on the barrier.
+    nstates: int, optional
+        the number of states, 3 for (IS, TS, FS), 2 for (IS, FS), default is 3.
+    ascending: bool, optional
+        if FS is higher than IS, only used for 2 states, default is True.
+    kind: str, optional
+        the kind of interpolation ('spline', 'hermite'), default is 'spline'.
+
+    Return:
+    -------
+    Read-only 2-D float64 array with shape (n, nstates).
+    """
+    if nstates not in (2, 3):
+        raise ValueError("nstates must be 2 or 3")
+
+    if kind not in ("spline", "hermite"):
+        raise ValueError("barrier templates are only available for 'spline' and 'hermite'")
+
+    key = (float(peak_width), n, nstates, bool(ascending) if nstates == 2 else None, kind)
+
+    template = _template_cache.get(key)
+    if template is None:
+        if nstates == 3:
+            template = _barrier_basis(peak_width, n, kind)
         else:
-            energy_list.insert(1, energies[0]+1e-100)
-            init_x_b = np.array([0.0, 1e-5, peak_width])
-        energies = tuple(energy_list)
+            template = _step_basis(peak_width, n, ascending, kind)
+        template.flags.writeable = False
+        _template_cache.put(key, template)
 
-        init_y_b = np.array(energies)
-        f_b = interpolate.interp1d(init_x_b, init_y_b, kind='quadratic')
-        x_b = np.linspace(0, peak_width, n)
-        y_b = f_b(x_b)
-        x_b = x_b + hline_length
+    return template
+    # }}}
 
-        # initial state y
-        y_i = np.linspace(energies[0], energies[0], n)
-        x_i = np.linspace(0, hline_length, n)
 
-        # final state y
-        y_f = np.linspace(energies[-1], energies[-1], n)
-        x_f = np.linspace(hline_length + peak_width,
-                          2*hline_length + peak_width, n)
+def precompute_barrier_templates(peak_widths, n=100, kind="spline"):
+    # {{{
+    """
+    Precompute barrier templates on a grid of peak widths, see `barrier_template`.
 
-        # Combine all points
-        y = np.concatenate([y_i, y_b, y_f])
-        x = np.concatenate([x_i, x_b, x_f])
-        x2 = 0.0
+    Parameters:
+    -----------
+    peak_widths: float list, the peak widths in grid.
+    n: int, optional, the number of points on barrier, default is 100.
+    kind: str, optional, the kind of interpolation, default is 'spline'.
+    """
+    for peak_width in np.unique(peak_widths):
+        barrier_template(peak_width, n, nstates=3, kind=kind)
+        barrier_template(peak_width, n, nstates=2, ascending=True, kind=kind)
+        barrier_template(peak_width, n, nstates=2, ascending=False, kind=kind)
+    # }}}
 
-#    plt.plot(x, y)
-#    plt.show()
-    return x, y
+
+def clear_barrier_templates():
+    """
+    Clear all cached barrier templates.
+    """
+    _template_cache.clear()
+
+
+def _fill_barriers(y_b, energies, rows, peak_width, n, ascending=True, kind="spline"):
+    # {{{
+    """
+    Private helper function to fill barrier points of rows sharing a peak width.
+
+    A template costs one interpolation for each state, so it is only used when
+    there are at least as many rows as states, rows of rare widths are
+    interpolated directly without touching the template cache.
+    """
+    indices = np.flatnonzero(rows)
+    nstates = energies.shape[1]
+
+    if len(indices) >= nstates:
+        template = barrier_template(peak_width, n, nstates, ascending, kind)
+        y_b[indices] = energies[indices].dot(template.T)
+    else:
+        for idx in indices:
+            _, y_b[idx] = get_barrier_points(energies[idx], n, peak_width, kind)
     # }}}
 
+
+def batch_potential_energy_points(energies,
+                                  n=100,
+                                  hline_lengths=1.0,
+                                  peak_widths=1.0,
+                                  kind="spline",
+                                  dtype=np.float64,
+                                  errors="raise"):
+    # {{{
+    """
+    Get all points for many reaction processes at once.
+
+    Parameters
+    ----------
+    energies : 2-D array like
+        Energies with shape (N, 3) for (E_IS, E_TS, E_FS) rows or
+        shape (N, 2) for (E_IS, E_FS) rows.
+    n : int, optional
+        Number of points interpolated.
+    hline_lengths : float or 1-D array like, optional
+        Length(s) of the horizontal line for the IS & FS, one for each row.
+    peak_widths : float or 1-D array like, optional
+        Width(s) of the peak, one for each row.
+    kind: str, optional
+        Specifies the kind of interpolation as a string ('quadratic', 'spline',
+        'hermite'), 'hermite' is free of SciPy. Default is 'spline'.
+    dtype: data-type, optional
+        The data type of returned points, default is np.float64.
+    errors: str, optional
+        How to handle rows with abnormal energies or without real root for
+        'quadratic' kind ('raise', 'mask'). 'raise' raises a ValueError,
+        'mask' fills y values of these rows with NaN so that other rows can
+        still be used. Default is 'raise'.
+
+    Return:
+    -------
+    (points for x, points for y), two 2-D arrays of dtype with shape (N, 3n),
+    row i is the same with `get_potential_energy_points(energies[i], ...)`
+    within floating point rounding.
+
+    Examples
+    --------
+    >>> x, y = batch_potential_energy_points([[0.0, 1.2, 0.7], [0.0, 0.9, -0.3]])
+    >>> x.shape
+    (2, 300)
+    """
+    if kind not in ("spline", "quadratic", "hermite"):
+        raise ValueError(("Invalide interpolation kind({}) which should be" +
+                          "in ('quadiatic', 'spline', 'hermite')").format(kind))
+
+    if errors not in ("raise", "mask"):
+        raise ValueError(("Invalide errors({}) which should be" +
+                          "in ('raise', 'mask')").format(errors))
+
+    energies = np.asarray(energies, dtype=np.float64)
+    if energies.ndim != 2 or energies.shape[1] not in (2, 3):
+        raise ValueError("energies must be an array with shape (N, 3) or (N, 2)")
+
+    nrows = energies.shape[0]
+    hline_lengths = np.broadcast_to(np.asarray(hline_lengths, dtype=np.float64), (nrows,))
+    peak_widths = np.broadcast_to(np.asarray(peak_widths, dtype=np.float64), (nrows,))
+
+    # Check all energy tuples.
+    invalid = np.zeros(nrows, dtype=bool)
+    if energies.shape[1] == 3:
+        invalid = ~(energies[:, 1] > np.maximum(energies[:, 0], energies[:, 2]))
+
+    # Barrier points.
+    y_b = np.empty((nrows, n))
+
+    if energies.shape[1] == 3 and kind == "quadratic":
+        # The quadratic barrier is not linear in energies.
+        y1, y2, y3 = energies.T
+        x2, m, valid = quadratic_interp_coefficients(0.0, y1, peak_widths, y3, y2)
+        invalid |= ~valid
+
+        x = np.linspace(0, peak_widths, n, axis=1)
+        y_b[...] = m[:, np.newaxis]*(x - x2[:, np.newaxis])**2 + y2[:, np.newaxis]
+    elif energies.shape[1] == 3:
+        for width in np.unique(peak_widths):
+            rows = peak_widths == width
+            _fill_barriers(y_b, energies, rows & ~invalid, width, n, kind=kind)
+    else:
+        # Lines without barrier are the same for 'spline' and 'quadratic'.
+        template_kind = "hermite" if kind == "hermite" else "spline"
+        ascending = energies[:, 0] < energies[:, -1]
+        for width in np.unique(peak_widths):
+            for direction in (True, False):
+                rows = (peak_widths == width) & (ascending == direction)
+                _fill_barriers(y_b, energies, rows, width, n, direction, template_kind)
+
+    # Horizontal lines for IS and FS.
+    x_i = np.linspace(0, hline_lengths, n, axis=1)
+    x_b = np.linspace(0, peak_widths, n, axis=1) + hline_lengths[:, np.newaxis]
+    x_f = np.linspace(hline_lengths + peak_widths,
+                      2*hline_lengths + peak_widths, n, axis=1)
+
+    y_i = np.repeat(energies[:, :1], n, axis=1)
+    y_f = np.repeat(energies[:, -1:], n, axis=1)
+
+    x = np.concatenate([x_i, x_b, x_f], axis=1)
+    y = np.concatenate([y_i, y_b, y_f], axis=1)
+
+    if np.any(invalid):
+        if errors == "raise":
+            rows = np.flatnonzero(invalid).tolist()
+            raise ValueError("abnormal energies in rows {}".format(rows))
+        y[invalid] = np.nan
+
+    return x.astype(dtype, copy=False), y.astype(dtype, copy=False)
+    # }}}
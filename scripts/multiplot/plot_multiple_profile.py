@@ -3,7 +3,6 @@
 
 from __future__ import print_function
 
-from catplot.ep_components.ep_lines import ElementaryLine
 from catplot.ep_components.ep_chain import EPChain
 from catplot.ep_components.ep_canvas import EPCanvas
 
@@ -26,19 +25,13 @@ for idx, (energy_tuples,
                                       locs["colors"],
                                       locs["initial_xs"],
                                       locs["initial_ys"])):
-    lines = []
-    for hline_length, peak_width, energies in zip(hline_lengths, peak_widths, energy_tuples):
-        # Create an elementary line.
-        line = ElementaryLine(energies,
-                              hline_length=hline_length,
-                              peak_width=peak_width,
-                              line_width=line_width,
-                              color=color,
-                              shadow_depth=locs["shadow_depth"],
-                              shadow_color=locs["shadow_color"])
-        lines.append(line)
-
-    chain = EPChain(lines)
+    chain = EPChain.from_energies(energy_tuples,
+                                  hline_lengths=hline_lengths,
+                                  peak_widths=peak_widths,
+                                  line_width=line_width,
+                                  color=color,
+                                  shadow_depth=locs["shadow_depth"],
+                                  shadow_color=locs["shadow_color"])
     chain.translate(initial_x, "x")
     chain.translate(initial_y, "y")
     chains.append(chain)
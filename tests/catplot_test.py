@@ -19,6 +19,11 @@ from edge_3d_test import Edge3DTest
 from grid_3d_canvas_test import Grid3DCanvasTest
 from supercell_3d_test import SuperCell3DTest
 from plane_3d_test import Plane3DTest
+from interpolate_test import InterpolateTest
+from ep_line_array_test import ElementaryLineArrayTest
+from ep_analysis_test import EPAnalysisTest
+from chem_parser_test import ChemParserTest
+from item_list_test import ItemListTest
 
 def suite():
     test_suite = unittest.TestSuite([
@@ -35,6 +40,11 @@ def suite():
         unittest.TestLoader().loadTestsFromTestCase(Grid3DCanvasTest),
         unittest.TestLoader().loadTestsFromTestCase(SuperCell3DTest),
         unittest.TestLoader().loadTestsFromTestCase(Plane3DTest),
+        unittest.TestLoader().loadTestsFromTestCase(InterpolateTest),
+        unittest.TestLoader().loadTestsFromTestCase(ElementaryLineArrayTest),
+        unittest.TestLoader().loadTestsFromTestCase(EPAnalysisTest),
+        unittest.TestLoader().loadTestsFromTestCase(ChemParserTest),
+        unittest.TestLoader().loadTestsFromTestCase(ItemListTest),
     ])
 
     return test_suite
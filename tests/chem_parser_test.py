@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Test case for chemical equation parser.
+"""
+
+import unittest
+
+from catplot import chem_parser
+from catplot.chem_parser import RxnEquation, ChemState, ChemFormula, ChemFormulaError
+
+
+class ChemParserTest(unittest.TestCase):
+
+    def setUp(self):
+        self.maxDiff = True
+        chem_parser.clear_caches()
+
+    def test_rxn_equation(self):
+        """ Make sure we can parse reaction equation correctly.
+        """
+        rxn_equation = RxnEquation("CO_g + *_s <-> CO_s -> CO2_g + 2*_s")
+
+        ref_states = ["CO_g + *_s", "CO_s", "CO2_g + 2*_s"]
+        self.assertListEqual([str(state) for state in rxn_equation.tolist()], ref_states)
+
+        ref_tex = (r"CO(g) + *(s) \leftrightarrow CO(s) \rightarrow " +
+                   r"CO_{2}(g) + 2*(s)")
+        self.assertEqual(rxn_equation.texen(), ref_tex)
+
+        rxn_equation = RxnEquation("CO_s + O_s -> CO2_g + 2*_s")
+        ref_tex = r"CO(s) + O(s) \rightarrow CO_{2}(g) + 2*(s)"
+        self.assertEqual(rxn_equation.texen(), ref_tex)
+
+    def test_chem_formula(self):
+        """ Make sure we can split chemical formula correctly.
+        """
+        formula = ChemFormula("2CO2_2s")
+        self.assertTupleEqual(formula.split(), (2, "CO2", 2, "s"))
+        self.assertEqual(formula.stoich, 2)
+        self.assertEqual(formula.species, "CO2")
+        self.assertEqual(formula.texen(), r"2CO_{2}(s)")
+
+        self.assertRaises(ChemFormulaError, ChemFormula, "CO")
+        self.assertRaises(ChemFormulaError, ChemFormula, "CO")
+
+    def test_cache(self):
+        """ Make sure repeated equations and species are parsed only once.
+        """
+        equation = "CO_g + *_s -> CO_s"
+        tex = RxnEquation(equation).texen()
+        states = RxnEquation(equation).tolist()
+
+        self.assertEqual(RxnEquation(equation).texen(), tex)
+        self.assertIn((equation,), chem_parser.parse_states.cache)
+        self.assertIn(("CO_s",), chem_parser.parse_formula.cache)
+        self.assertIn(("*_s",), chem_parser.formula_texen.cache)
+        self.assertIn((equation,), chem_parser.rxn_texen.cache)
+
+        # New state objects are created for each call.
+        self.assertIsNot(RxnEquation(equation).tolist()[0], states[0])
+        self.assertEqual(ChemState("CO_g + *_s").texen(), r"CO(g) + *(s)")
+
+        chem_parser.clear_caches()
+        self.assertDictEqual(chem_parser.rxn_texen.cache, {})
+        self.assertEqual(RxnEquation(equation).texen(), tex)
+
+if "__main__" == __name__:
+    suite = unittest.TestLoader().loadTestsFromTestCase(ChemParserTest)
+    unittest.TextTestRunner(verbosity=2).run(suite)
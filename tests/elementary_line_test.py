@@ -4,9 +4,15 @@
 """ Test case for ElementaryLine.
 """
 
+import gzip
+import os
+import shutil
+import tempfile
 import unittest
 
-from catplot.ep_components.ep_lines import ElementaryLine
+import numpy as np
+
+from catplot.ep_components.ep_lines import ElementaryLine, EPLine, load_ep_data
 
 
 class ElementaryLineTest(unittest.TestCase):
@@ -47,6 +53,65 @@ class ElementaryLineTest(unittest.TestCase):
         # Check invalid energy tuple.
         self.assertRaises(ValueError, ElementaryLine, [0.0, 1.2, 1.5])
 
+    def test_adaptive_sampling(self):
+        """ Make sure the adaptive line has less points with the same shape.
+        """
+        line = ElementaryLine([0.0, 1.2, 0.7], sampling="adaptive")
+        ref_line = ElementaryLine([0.0, 1.2, 0.7])
+
+        self.assertEqual(line.sampling, "adaptive")
+        self.assertLess(len(line.x), 60)
+        self.assertAlmostEqual(line.eigen_points.C[1], ref_line.eigen_points.C[1], places=3)
+        self.assertTupleEqual(line.eigen_points.E, ref_line.eigen_points.E)
+
+        # Check invalid sampling method and tolerance.
+        self.assertRaises(ValueError, ElementaryLine, [0.0, 1.2, 0.7], sampling="abc")
+        self.assertRaises(ValueError, ElementaryLine, [0.0, 1.2, 0.7],
+                          sampling="adaptive", tolerance=-1)
+        self.assertRaises(ValueError, setattr, line, "tolerance", 0.0)
+
+    def test_dtype(self):
+        """ Make sure the data type of points can be changed.
+        """
+        line = ElementaryLine([0.0, 1.2, 0.7], dtype=np.float32)
+        self.assertEqual(line.x.dtype, np.float32)
+        self.assertEqual(line.y.dtype, np.float32)
+
+        line.translate(0.5, "x").translate_state("FS", 0.1)
+        self.assertEqual(line.x.dtype, np.float32)
+        self.assertEqual(line.y.dtype, np.float32)
+
+        line = ElementaryLine([0.0, 1.2, 0.7])
+        self.assertEqual(line.y.dtype, np.float64)
+
+    def test_hermite(self):
+        """ Make sure the line can be interpolated by Hermite segments.
+        """
+        line = ElementaryLine([0.0, 1.2, 0.7], interp_method="hermite")
+        self.assertEqual(line.interp_method, "hermite")
+        self.assertAlmostEqual(line.eigen_points.C[1], 1.2, places=3)
+
+    def test_template(self):
+        """ Make sure the line can be created from barrier templates.
+        """
+        line = ElementaryLine([0.0, 1.2, 0.7], template=True)
+        ref_line = ElementaryLine([0.0, 1.2, 0.7])
+
+        self.assertTrue(line.template)
+        self.assertTrue(np.allclose(line.y, ref_line.y))
+
+        # Invalid settings for templates are checked before interpolation.
+        self.assertRaises(ValueError, ElementaryLine, [0.0, 1.2, 0.7],
+                          interp_method="quadratic", template=True)
+        self.assertRaises(ValueError, ElementaryLine, [0.0, 1.2, 0.7],
+                          sampling="adaptive", template=True)
+        self.assertRaises(ValueError, setattr, line, "interp_method", "quadratic")
+        self.assertRaises(ValueError, setattr, line, "sampling", "adaptive")
+
+        # Quadratic lines without barrier can use templates.
+        line = ElementaryLine([0.0, 0.5], interp_method="quadratic", template=True)
+        self.assertRaises(ValueError, setattr, line, "energies", [0.0, 1.2, 0.7])
+
     def test_translate(self):
         """ Make sure all points in line can be translated correctly.
         """
@@ -86,6 +151,28 @@ class ElementaryLineTest(unittest.TestCase):
         self.assertTupleEqual(eigen_pts.D, (2.0, 0.80000000000000004))
         self.assertTupleEqual(eigen_pts.E, (3.0, 0.80000000000000004))
 
+    def test_cached_eigen_pts(self):
+        """ Make sure the cached eigen points follow the translation.
+        """
+        line = ElementaryLine([0.0, 1.2, 0.8])
+        ref_c = line.eigen_points.C
+        idx = line._peak_index
+
+        line.translate(1.0, "x").translate(-0.5, "y")
+        self.assertEqual(line._peak_index, idx)
+        self.assertTupleEqual(line.eigen_points.C, (ref_c[0] + 1.0, ref_c[1] - 0.5))
+        self.assertTupleEqual(line.eigen_points.A, (1.0, -0.5))
+
+        # The peak is located again after attributes change.
+        line.peak_width = 2.0
+        self.assertIsNone(line._peak_index)
+        self.assertEqual(line.eigen_points.C[1], np.max(line.y))
+
+        # No interpolation for lines without barrier.
+        line = ElementaryLine([0.0, 0.8]).translate(1.0, "x")
+        self.assertTupleEqual(line.eigen_points.E, (4.0, 0.8))
+        self.assertIsNone(line._x)
+
     def test_scales(self):
         """ Test scales for x and y values.
         """
@@ -93,6 +180,35 @@ class ElementaryLineTest(unittest.TestCase):
         self.assertEqual(line.scale_x, 3.0)
         self.assertEqual(line.scale_y, 1.2003292394429861)
 
+    def test_lazy_points(self):
+        """ Make sure points are interpolated lazily and updated with attributes.
+        """
+        line = ElementaryLine([0.0, 1.2, 0.7], n=2)
+        self.assertIsNone(line._x)
+
+        # Translation before interpolation.
+        line.translate(0.5, "x").translate(-0.5, "y")
+        self.assertIsNone(line._x)
+        self.assertListEqual(line.x.tolist(), [0.5, 1.5, 1.5, 2.5, 2.5, 3.5])
+        self.assertEqual(line.y[0], -0.5)
+
+        # Points are interpolated again at the same position.
+        line.hline_length = 2.0
+        self.assertIsNone(line._x)
+        self.assertListEqual(line.x.tolist(), [0.5, 2.5, 2.5, 3.5, 3.5, 5.5])
+        self.assertEqual(line.y[0], -0.5)
+
+        line.n = 3
+        self.assertEqual(len(line.y), 9)
+
+        line.energies = [0.0, 1.0, 0.2]
+        self.assertAlmostEqual(line.y[-1], -0.3)
+
+        # Energies can only be changed by setting new ones.
+        self.assertTupleEqual(line.energies, (0.0, 1.0, 0.2))
+        with self.assertRaises(TypeError):
+            line.energies[1] = 2.0
+
     def test_translate_state(self):
         """ Test we can translate specific state correctly.
         """
@@ -115,6 +231,79 @@ class ElementaryLineTest(unittest.TestCase):
         # Check invalid state name.
         self.assertRaises(ValueError, line.translate_state, "asd", 0.3)
 
+        # Styles and translation are kept.
+        line = ElementaryLine([0.0, 1.3, 0.8], n=10, color="#FF0000")
+        line.translate(2.0, "x").translate(1.0, "y")
+        line.translate_state("FS", 0.1)
+        self.assertEqual(line.color, "#FF0000")
+        self.assertEqual(len(line.x), 30)
+        self.assertTupleEqual(line.eigen_points.A, (2.0, 1.0))
+        self.assertAlmostEqual(line.eigen_points.E[1], 1.9)
+
+    def test_incremental_translate_state(self):
+        """ Make sure the states are translated in place with the same shape.
+        """
+        for sampling in ["uniform", "adaptive"]:
+            line = ElementaryLine([0.0, 1.3, 0.8], sampling=sampling)
+            line.translate(1.0, "x").translate(0.5, "y")
+            x, y = line.x, line.y
+
+            line.translate_state("IS", -0.2).translate_state("TS", 0.3)
+            line.translate_state("FS", -0.4)
+
+            ref_line = ElementaryLine([0.0, 1.8, 0.6], sampling=sampling)
+            ref_line.translate(1.0, "x").translate(0.3, "y")
+
+            self.assertTupleEqual(line.energies, ref_line.energies)
+            self.assertTrue(np.allclose(line.x, ref_line.x))
+            self.assertTrue(np.allclose(line.y, ref_line.y))
+            self.assertTupleEqual(line.eigen_points.C, ref_line.eigen_points.C)
+
+            if sampling == "uniform":
+                # Points are updated in place.
+                self.assertIs(line.x, x)
+                self.assertIs(line.y, y)
+
+        # Lines without barrier have no TS.
+        line = ElementaryLine([0.0, 0.8]).translate_state("FS", 0.1)
+        self.assertAlmostEqual(line.y[-1], 0.9)
+        self.assertRaises(ValueError, line.translate_state, "TS", 0.1)
+
+    def test_binary_export(self):
+        """ Make sure line data can be exported to binary files and loaded back.
+        """
+        line = ElementaryLine([0.0, 1.2, 0.6], n=10)
+        tmpdir = tempfile.mkdtemp()
+
+        try:
+            for ext in [".npy", ".npz"]:
+                filename = os.path.join(tmpdir, "line" + ext)
+                line.export(filename)
+                data = load_ep_data(filename)
+                self.assertListEqual(data.x.tolist(), line.x.tolist())
+                self.assertListEqual(data.y.tolist(), line.y.tolist())
+                self.assertListEqual(data.offsets.tolist(), [0, 30])
+
+            # Memory-map the data back.
+            filename = os.path.join(tmpdir, "line.npy")
+            loaded_line = EPLine.load(filename, mmap_mode="r", color="#ff0000")
+            self.assertListEqual(loaded_line.y.tolist(), line.y.tolist())
+            self.assertEqual(loaded_line.color, "#ff0000")
+            self.assertFalse(loaded_line.x.flags.writeable)
+            del loaded_line
+
+            self.assertRaises(ValueError, load_ep_data, os.path.join(tmpdir, "line.csv"))
+
+            # Csv files are compressed with a .gz suffix.
+            filename = os.path.join(tmpdir, "line.csv.gz")
+            line.export(filename)
+            with gzip.open(filename, "rb") as f:
+                data = np.loadtxt(f, delimiter=",")
+            self.assertListEqual(data[:, 0].tolist(), line.x.tolist())
+            self.assertListEqual(data[:, 1].tolist(), line.y.tolist())
+        finally:
+            shutil.rmtree(tmpdir)
+
 if "__main__" == __name__: 
     suite = unittest.TestLoader().loadTestsFromTestCase(ElementaryLineTest)
     unittest.TextTestRunner(verbosity=2).run(suite) 
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Test case for energetic span analysis.
+"""
+
+import unittest
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from catplot.ep_components.ep_analysis import energetic_span, energetic_spans
+from catplot.ep_components.ep_canvas import EPCanvas
+from catplot.ep_components.ep_chain import EPChain
+from catplot.ep_components.ep_lines import ElementaryLine
+
+
+class EPAnalysisTest(unittest.TestCase):
+
+    def setUp(self):
+        self.maxDiff = True
+
+    def test_energetic_span(self):
+        """ Make sure we can get correct energetic span of a sequence.
+        """
+        energies = [(0.0, 0.5, -1.0), (0.0, 0.7, 0.2), (0.0, 0.9, 0.5)]
+        result = energetic_span(energies)
+
+        self.assertAlmostEqual(result.span, 1.2)
+        self.assertEqual(result.tdts, 0)
+        self.assertEqual(result.tdi, 1)
+        self.assertAlmostEqual(result.max_barrier, 0.9)
+        self.assertEqual(result.rds, 2)
+
+        # Check invalid energies.
+        self.assertRaises(ValueError, energetic_span, [(0.0,)])
+        self.assertRaises(ValueError, energetic_span, [])
+
+    def test_energetic_spans(self):
+        """ Make sure sequences with different lengths can be analyzed together.
+        """
+        tables = [[(0.0, 0.5, -1.0), (0.0, 0.7, 0.2), (0.0, 0.9, 0.5)],
+                  np.array([[0.0, np.nan, 0.6], [0.0, 1.0, 0.2]]),
+                  EPChain([ElementaryLine([0.0, 0.6]), ElementaryLine([0.0, 1.0, 0.2])])]
+        results = energetic_spans(tables)
+
+        self.assertTrue(np.allclose(results.span, [1.2, 1.6, 1.6]))
+        self.assertListEqual(results.tdts.tolist(), [0, 1, 1])
+        self.assertListEqual(results.tdi.tolist(), [1, 0, 0])
+        self.assertTrue(np.allclose(results.max_barrier, [0.9, 1.0, 1.0]))
+        self.assertListEqual(results.rds.tolist(), [2, 1, 1])
+
+    def test_chain_energetic_span(self):
+        """ Make sure the TDTS and TDI of a chain can be highlighted.
+        """
+        chain = EPChain([ElementaryLine([0.0, 0.5, -1.0]),
+                         ElementaryLine([0.0, 0.7, 0.2]),
+                         ElementaryLine([0.0, 0.9, 0.5])])
+
+        self.assertEqual(chain.energy_table.shape, (3, 3))
+        self.assertTupleEqual(chain.energetic_span()[1:3], (0, 1))
+
+        canvas = EPCanvas()
+        canvas.add_chain(chain)
+        canvas.add_energetic_span_annotations(chain)
+        canvas.draw()
+        plt.close(canvas.figure)
+
+if "__main__" == __name__: 
+    suite = unittest.TestLoader().loadTestsFromTestCase(EPAnalysisTest)
+    unittest.TextTestRunner(verbosity=2).run(suite) 
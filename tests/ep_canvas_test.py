@@ -4,6 +4,7 @@
 """ Test case for Energy Profle Canvas.
 """
 
+import pickle
 import unittest
 
 import matplotlib.pyplot as plt
@@ -47,6 +48,134 @@ class EPCanvasTest(unittest.TestCase):
         canvas.draw()
         plt.close(canvas.figure)
 
+    def test_draw_shadows(self):
+        """ Make sure shadows are drawn by depth level and not duplicated.
+        """
+        canvas = EPCanvas()
+        l1 = ElementaryLine([0.0, 1.3, 0.8], shadow_depth=3)
+        l2 = ElementaryLine([0.0, 0.5], shadow_depth=2, shadow_color="#ff0000")
+        canvas.add_lines([l1, l2])
+        canvas.draw()
+
+        self.assertEqual(len(canvas.shadow_lines), 3)
+        self.assertEqual(len(canvas.shadow_lines[1].get_segments()), 2)
+        self.assertEqual(len(canvas.shadow_lines[2].get_segments()), 1)
+
+        canvas.draw()
+        canvas.redraw()
+        self.assertEqual(len(canvas.shadow_lines), 3)
+        self.assertEqual(len(canvas.axes.collections), 3)
+        plt.close(canvas.figure)
+
+    def test_incremental_draw(self):
+        """ Make sure only new or changed artists are created in drawing.
+        """
+        canvas = EPCanvas()
+        l1 = ElementaryLine([0.0, 1.2, 0.6])
+        l2 = ElementaryLine([0.0, 1.0, 0.8])
+        chain = EPChain([l1, l2])
+        canvas.add_chain(chain)
+        canvas.add_energy_annotations(l2)
+        canvas.draw()
+
+        artist = canvas.axes.lines[0]
+        texts = list(canvas.axes.texts)
+        self.assertEqual(len(canvas.axes.lines), 2)
+
+        # Nothing changes.
+        canvas.draw()
+        self.assertIs(canvas.axes.lines[0], artist)
+        self.assertListEqual(list(canvas.axes.texts), texts)
+
+        # A new line is added and an old one is changed.
+        l3 = ElementaryLine([0.0, 0.5])
+        chain.append(l3)
+        canvas.add_line(l3)
+        l2.translate_state("FS", -0.2)
+        canvas.draw()
+
+        self.assertEqual(len(canvas.axes.lines), 3)
+        self.assertIs(canvas.axes.lines[0], artist)
+        self.assertListEqual(canvas.axes.lines[2].get_ydata().tolist(), l3.y.tolist())
+        self.assertEqual(len(canvas.axes.texts), len(texts))
+        self.assertFalse(set(canvas.axes.texts) & set(texts))
+        self.assertAlmostEqual(l3.eigen_points.E[1], 1.7)
+        self.assertAlmostEqual(canvas.axes.get_ylim()[1], 1.7 + 0.17)
+
+        # Redraw creates all artists again.
+        canvas.redraw()
+        self.assertEqual(len(canvas.axes.lines), 3)
+        self.assertEqual(len(canvas.axes.texts), len(texts))
+
+        # Removed lines are removed from axes.
+        canvas.lines = [l1]
+        canvas.draw()
+        self.assertEqual(len(canvas.axes.lines), 1)
+        plt.close(canvas.figure)
+
+    def test_data_limits(self):
+        """ Make sure the bounding box of lines is maintained.
+        """
+        canvas = EPCanvas(margin_ratio=1.0)
+        l1 = ElementaryLine([0.0, 1.2, 0.6], n=5)
+        l2 = ElementaryLine([0.0, 1.0, 0.8], n=5)
+        canvas.add_lines([l1, l2])
+
+        limits = canvas._get_data_limits()
+        self.assertTupleEqual(canvas._bbox, (3.0, 0.0, 1.2, 0.0))
+        bounds = canvas._bounds[id(l1)]
+
+        # Translation of a line inside the box.
+        l2.translate(0.1, "y")
+        self.assertTupleEqual(canvas._get_data_limits(), limits)
+        self.assertIs(canvas._bounds[id(l1)], bounds)
+        self.assertEqual(canvas._bounds[id(l2)][1], l2._version)
+
+        # Translation beyond the box.
+        l2.translate(4.0, "x")
+        canvas._get_data_limits()
+        self.assertTupleEqual(canvas._bbox, (7.0, 0.0, 1.2, 0.0))
+
+        # Remove the line defining the box.
+        canvas.lines = [l1]
+        canvas._get_data_limits()
+        self.assertTupleEqual(canvas._bbox, (3.0, 0.0, 1.2, 0.0))
+        self.assertNotIn(id(l2), canvas._bounds)
+        plt.close(canvas.figure)
+
+    def test_pickle_lines(self):
+        """ Make sure lines in canvas can still be pickled.
+        """
+        canvas = EPCanvas()
+        line = ElementaryLine([0.0, 1.2, 0.6])
+        canvas.add_line(line)
+        canvas.draw()
+
+        new_line = pickle.loads(pickle.dumps(line))
+        self.assertListEqual(new_line.y.tolist(), line.y.tolist())
+        plt.close(canvas.figure)
+
+    def test_draw_collection(self):
+        """ Make sure lines with the same style are drawn as one collection.
+        """
+        canvas = EPCanvas(render_mode="collection")
+        l1 = ElementaryLine([0.0, 1.3, 0.8])
+        l2 = ElementaryLine([0.0, 1.0, 0.2], color="#ff0000")
+        l3 = ElementaryLine([0.0, 0.5])
+        l4 = ElementaryLine([0.0, 0.7, 0.2], sampling="adaptive")
+        canvas.add_lines([l1, l2, l3, l4])
+        canvas.draw()
+
+        self.assertFalse(canvas.axes.lines)
+        self.assertEqual(len(canvas.axes.collections), 2)
+        segments = canvas.axes.collections[0].get_segments()
+        self.assertEqual(len(segments), 3)
+        self.assertListEqual(segments[1][:, 1].tolist(), l3.y.tolist())
+        self.assertEqual(len(segments[2]), len(l4.x))
+        plt.close(canvas.figure)
+
+        self.assertRaises(ValueError, EPCanvas, render_mode="patches")
+
     def test_add_species_annotations(self):
         """ Make sure the species annotations can be added without exceptions.
         """
@@ -84,6 +213,30 @@ class EPCanvasTest(unittest.TestCase):
         canvas.add_energy_annotations(line)
         plt.close(canvas.figure)
 
+    def test_remove_decorations(self):
+        """ Make sure decorations of lines removed from canvas are removed.
+        """
+        canvas = EPCanvas()
+        l1 = ElementaryLine([0.0, 1.3, 0.8])
+        l2 = ElementaryLine([0.0, 1.0, 0.2])
+        canvas.add_lines([l1, l2])
+        canvas.add_energy_annotations(l1)
+        canvas.add_energy_annotations(l2)
+        canvas.draw()
+        self.assertEqual(len(canvas.axes.texts), 4)
+
+        canvas.lines.remove(l2)
+        canvas.draw()
+        self.assertEqual(len(canvas.axes.texts), 2)
+        self.assertEqual(len(canvas._decorations), 1)
+
+        # Decorations are created again after clearing.
+        canvas.clear()
+        canvas.add_energy_annotations(l1)
+        canvas.draw()
+        self.assertEqual(len(canvas.axes.texts), 2)
+        plt.close(canvas.figure)
+
     def test_add_chain(self):
         """ Test energy profile chain can be added correctly to canvas.
         """
@@ -143,6 +296,68 @@ class EPCanvasTest(unittest.TestCase):
         canvas.lines = []
         self.assertRaises(ValueError, canvas.add_lines, [l1, l1])
 
+        # Nothing is added for an invalid batch.
+        l3 = ElementaryLine([0.0, 0.8])
+        canvas.add_line(l1)
+        self.assertRaises(ValueError, canvas.add_lines, [l3, l1])
+        self.assertRaises(ValueError, canvas.add_lines, [l3, "line"])
+        self.assertFalse(l3 in canvas)
+        self.assertEqual(len(canvas.lines), 1)
+
+        plt.close(canvas.figure)
+
+    def test_change_lines_in_place(self):
+        """ Make sure the canvas follows lines changed in place.
+        """
+        canvas = EPCanvas(margin_ratio=1.0)
+        l1 = ElementaryLine([0.0, 1.2, 0.6], n=5)
+        l2 = ElementaryLine([0.0, 1.0, 0.8], n=5)
+        l2.translate(10.0, "x")
+        canvas.add_lines([l1, l2])
+        canvas.draw()
+        self.assertTupleEqual(canvas._bbox, (13.0, 0.0, 1.2, 0.0))
+
+        canvas.lines.remove(l2)
+        self.assertFalse(l2 in canvas)
+        canvas.redraw()
+        self.assertTupleEqual(canvas._bbox, (3.0, 0.0, 1.2, 0.0))
+        self.assertEqual(len(canvas.axes.lines), 1)
+
+        canvas.lines.append(l2)
+        self.assertTrue(l2 in canvas)
+        self.assertRaises(ValueError, canvas.add_line, l2)
+        canvas.draw()
+        self.assertTupleEqual(canvas._bbox, (13.0, 0.0, 1.2, 0.0))
+
+        canvas.lines[1:] = []
+        canvas.lines += [l2]
+        del canvas.lines[0]
+        self.assertFalse(l1 in canvas)
+        self.assertTrue(l2 in canvas)
+        self.assertIsInstance(canvas.lines, list)
+
+        plt.close(canvas.figure)
+
+    def test_add_chains(self):
+        """ Make sure chains can be added in a batch.
+        """
+        canvas = EPCanvas()
+
+        c1 = EPChain([ElementaryLine([0.0, 1.2, 0.6]), ElementaryLine([0.0, 0.8])])
+        c2 = EPChain([ElementaryLine([0.0, 1.0, 0.8])])
+        canvas.add_chains([c1, c2])
+
+        self.assertEqual(len(canvas.chains), 2)
+        self.assertEqual(len(canvas.lines), 3)
+        self.assertTrue(c2.elementary_lines[0] in canvas)
+
+        c3 = EPChain([ElementaryLine([0.0, 0.3])])
+        self.assertRaises(ValueError, canvas.add_chains, [c3, c1])
+        self.assertFalse(c3 in canvas)
+
+        canvas.chains = []
+        self.assertFalse(c1 in canvas)
+
         plt.close(canvas.figure)
 
     def test_add_all_horizontal_auxiliary_lines(self):
@@ -4,10 +4,17 @@
 """ Test case for ElementaryLine.
 """
 
+import copy
+import gzip
+import os
+import shutil
+import tempfile
 import unittest
 
-from catplot.ep_components.ep_lines import ElementaryLine
-from catplot.ep_components.ep_chain import EPChain
+import numpy as np
+
+from catplot.ep_components.ep_lines import ElementaryLine, load_ep_data
+from catplot.ep_components.ep_chain import EPChain, export_chains
 
 
 class EPChainTest(unittest.TestCase):
@@ -52,6 +59,21 @@ class EPChainTest(unittest.TestCase):
         # Appending a repeated line will raise an exception.
         self.assertRaises(ValueError, l.append, l2)
 
+    def test_translate_state(self):
+        """ Make sure the lines after translated FS follow it.
+        """
+        l1 = ElementaryLine([0.0, 1.2, 0.7])
+        l2 = ElementaryLine([0.0, 1.0, 0.5])
+        l3 = ElementaryLine([0.0, 0.8])
+        chain = EPChain([l1, l2, l3])
+
+        l2.translate_state("FS", -0.3)
+
+        self.assertAlmostEqual(l2.eigen_points.E[1], 0.9)
+        self.assertAlmostEqual(l3.eigen_points.A[1], 0.9)
+        self.assertAlmostEqual(l3.eigen_points.E[1], 1.7)
+        self.assertTupleEqual(l1.eigen_points.E, (3.0, 0.7))
+
     def test_membership(self):
         """ Test the `in` operator.
         """
@@ -62,6 +84,39 @@ class EPChainTest(unittest.TestCase):
         self.assertTrue(l1 in chain)
         self.assertFalse(l2 in chain)
 
+    def test_copy_lines(self):
+        """ Make sure copies of lines in chain are out of chain.
+        """
+        l1 = ElementaryLine([0.0, 1.2, 0.7])
+        l2 = ElementaryLine([0.0, 1.0, 0.5])
+        chain = EPChain([l1, l2])
+        ref_y = chain.y.copy()
+
+        # A copy can be changed and appended to chain.
+        line = copy.deepcopy(l1)
+        self.assertIsNone(line._chain)
+        self.assertFalse(line in chain)
+        line.translate_state("FS", 0.1)
+        self.assertTrue(np.allclose(chain.y, ref_y))
+
+        chain.append(line)
+        self.assertTrue(line in chain)
+
+        # A copied chain has its own lines.
+        new_chain = copy.deepcopy(chain)
+        new_chain.elementary_lines[0].translate_state("FS", 0.2)
+        self.assertAlmostEqual(new_chain.elementary_lines[1].eigen_points.A[1], 0.9)
+        self.assertAlmostEqual(l2.eigen_points.A[1], 0.7)
+
+        # Lines removed from the list directly are out of chain.
+        chain.elementary_lines.remove(l2)
+        self.assertFalse(l2 in chain)
+        self.assertEqual(chain._index(line), 1)
+        self.assertIsNone(chain._buffer)
+        l2.translate_state("FS", 0.1)
+        l1.translate_state("FS", -0.2)
+        self.assertAlmostEqual(line.eigen_points.A[1], 1.0)
+
     def test_iterable(self):
         """ Make sure the chain is iterable.
         """
@@ -87,6 +142,154 @@ class EPChainTest(unittest.TestCase):
         ret_y = chain.y.tolist()
         self.assertListEqual(ref_y, ret_y)
 
+    def test_dtype(self):
+        """ Make sure the data type of lines flows into chain data.
+        """
+        l1 = ElementaryLine([0.0, 1.2, 0.5], n=2, dtype=np.float32)
+        l2 = ElementaryLine([0.0, 0.8], n=2, dtype=np.float32)
+        chain = EPChain([l1, l2])
+
+        self.assertEqual(chain.dtype, np.float32)
+        self.assertEqual(chain.x.dtype, np.float32)
+        self.assertEqual(chain.y.dtype, np.float32)
+
+    def test_binary_export(self):
+        """ Make sure chain data can be exported to npz file with line offsets.
+        """
+        l1 = ElementaryLine([0.0, 1.2, 0.5], n=2)
+        l2 = ElementaryLine([0.0, 0.8], n=2)
+        chain = EPChain([l1, l2])
+        tmpdir = tempfile.mkdtemp()
+
+        try:
+            filename = os.path.join(tmpdir, "chain.npz")
+            chain.export(filename)
+            data = load_ep_data(filename)
+
+            self.assertListEqual(data.offsets.tolist(), [0, 6, 12])
+            self.assertListEqual(data.x.tolist(), chain.x.tolist())
+            self.assertListEqual(data.y.tolist(), chain.y.tolist())
+
+            (x1, y1), (x2, y2) = data.lines()
+            self.assertListEqual(x2.tolist(), l2.x.tolist())
+            self.assertListEqual(y2.tolist(), l2.y.tolist())
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_csv_export(self):
+        """ Make sure chains can be exported to csv files in chunks.
+        """
+        l1 = ElementaryLine([0.0, 1.2, 0.5], n=2)
+        l2 = ElementaryLine([0.0, 0.8], n=2)
+        chain = EPChain([l1, l2])
+        other_chain = EPChain([ElementaryLine([0.0, 0.3], n=2)])
+        tmpdir = tempfile.mkdtemp()
+
+        try:
+            filename = os.path.join(tmpdir, "chain.csv")
+            chain.export(filename, chunksize=5)
+            data = np.loadtxt(filename, delimiter=",")
+            self.assertListEqual(data[:, 0].tolist(), chain.x.tolist())
+            self.assertListEqual(data[:, 1].tolist(), chain.y.tolist())
+
+            # Lines are written in the same format by chain and line.
+            line_filename = os.path.join(tmpdir, "line.csv")
+            l1.export(line_filename)
+            with open(filename, "rb") as f, open(line_filename, "rb") as line_f:
+                line_text = line_f.read()
+                self.assertTrue(f.read().startswith(line_text))
+            self.assertTrue(line_text.startswith(b"0.0,0.0\r\n1.0,0.0\r\n"))
+
+            filename = os.path.join(tmpdir, "chains.csv.gz")
+            export_chains([chain, other_chain], filename, chunksize=4)
+            with gzip.open(filename, "rb") as f:
+                data = np.loadtxt(f, delimiter=",")
+            self.assertEqual(data.shape, (18, 3))
+            self.assertListEqual(data[:, 0].tolist(), [0]*12 + [1]*6)
+            self.assertListEqual(data[12:, 2].tolist(), other_chain.y.tolist())
+
+            self.assertRaises(ValueError, export_chains, [chain], filename, chunksize=0)
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_expand(self):
+        """ Make sure lines are joined end to end without interpolation.
+        """
+        lines = [ElementaryLine([0.0, 1.2, 0.5], hline_length=0.5),
+                 ElementaryLine([0.0, 0.8], peak_width=2.0),
+                 ElementaryLine([0.0, 1.0, -0.3])]
+        lines[0].translate(1.0, "y")
+        chain = EPChain(lines)
+
+        # Points are not interpolated for chain construction.
+        self.assertTrue(all(line._x is None for line in lines))
+
+        self.assertTupleEqual(lines[1].eigen_points.A, (2.0, 1.5))
+        self.assertTupleEqual(lines[2].eigen_points.A, (6.0, 2.3))
+
+        prev_line = lines[0]
+        for line in lines[1:]:
+            self.assertTupleEqual(line.eigen_points.A, prev_line.eigen_points.E)
+            prev_line = line
+
+    def test_buffer(self):
+        """ Make sure points of lines are views of the chain buffer.
+        """
+        l1 = ElementaryLine([0.0, 1.2, 0.5], n=2)
+        l2 = ElementaryLine([0.0, 0.8], n=2)
+        chain = EPChain([l1, l2])
+
+        # No copy for data access.
+        x, y = chain.x, chain.y
+        self.assertIs(chain.x, x)
+        self.assertTrue(np.shares_memory(l2.y, y))
+
+        # Translation on buffer.
+        chain.translate(1.0, "x")
+        self.assertListEqual(l1.x.tolist(), [1.0, 2.0, 2.0, 3.0, 3.0, 4.0])
+        self.assertTupleEqual(l2.eigen_points.A, (4.0, 0.5))
+
+        l1.translate_state("FS", 0.5)
+        self.assertListEqual(chain.y[-2:].tolist(), [1.8, 1.8])
+        self.assertIs(chain.y, y)
+
+        # Buffer is packed again when points of lines are replaced.
+        chain.setattr("peak_width", 2.0)
+        self.assertEqual(len(chain.x), 12)
+        self.assertIsNot(chain.x, x)
+        self.assertEqual(chain.x[-1], 8.0)
+        self.assertTrue(np.shares_memory(l1.x, chain.x))
+
+        self.assertRaises(ValueError, chain.translate, 1.0, "z")
+
+    def test_from_energies(self):
+        """ Make sure a chain can be created from an energy table.
+        """
+        energies = [(0.0, 1.2, 0.5), (0.0, 0.8), (0.0, 1.0, 0.3)]
+        chain = EPChain.from_energies(energies, n=2, peak_widths=[1.0, 1.0, 2.0],
+                                      color="#ff0000", shadow_depth=[0, 2, 0])
+        ref_chain = EPChain([ElementaryLine([0.0, 1.2, 0.5], n=2),
+                             ElementaryLine([0.0, 0.8], n=2),
+                             ElementaryLine([0.0, 1.0, 0.3], n=2, peak_width=2.0)])
+
+        self.assertTrue(np.allclose(chain.x, ref_chain.x))
+        self.assertTrue(np.allclose(chain.y, ref_chain.y))
+
+        l1, l2, l3 = chain
+        self.assertTupleEqual(l3.energies, (0.0, 1.0, 0.3))
+        self.assertFalse(l2.eigen_points.has_barrier)
+        self.assertEqual(l1.color, "#ff0000")
+        self.assertEqual(l2.shadow_depth, 2)
+        self.assertIs(l2._chain, chain)
+
+        # Table with NaN TS.
+        table = np.array([[0.0, 1.2, 0.5], [0.0, np.nan, 0.8]])
+        chain = EPChain.from_energies(table, n=2)
+        self.assertTrue(np.allclose(chain.y, ref_chain.y[:12]))
+
+        # Abnormal energies.
+        self.assertRaises(ValueError, EPChain.from_energies, [(0.0, 0.3, 0.5)])
+
 if "__main__" == __name__: 
     suite = unittest.TestLoader().loadTestsFromTestCase(EPChainTest)
     unittest.TextTestRunner(verbosity=2).run(suite) 
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Test case for ElementaryLineArray.
+"""
+
+import unittest
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from catplot.ep_components.ep_canvas import EPCanvas
+from catplot.ep_components.ep_chain import EPChain
+from catplot.ep_components.ep_lines import ElementaryLine
+from catplot.ep_components.ep_line_array import ElementaryLineArray
+
+
+class ElementaryLineArrayTest(unittest.TestCase):
+
+    def setUp(self):
+        self.maxDiff = True
+
+    def test_construction_and_query(self):
+        """ Make sure the lines in array are the same as ElementaryLine objects.
+        """
+        energies = [(0.0, 1.2, 0.7), (0.0, 0.8), (0.3, 1.0, 0.5)]
+        line_array = ElementaryLineArray(energies, n=10, colors=["#000000", "#ff0000", "#00ff00"])
+
+        self.assertEqual(len(line_array), 3)
+        self.assertEqual(line_array.x.shape, (90,))
+        self.assertListEqual(line_array.offsets.tolist(), [0, 30, 60, 90])
+        self.assertListEqual(line_array.has_barrier.tolist(), [True, False, True])
+        self.assertListEqual(line_array.peak_indices.tolist()[1:], [-1, 15])
+
+        for line, entry in zip(line_array, energies):
+            ref_line = ElementaryLine(entry, n=10)
+            self.assertTrue(np.allclose(line.x, ref_line.x))
+            self.assertTrue(np.allclose(line.y, ref_line.y))
+            self.assertEqual(line.eigen_points.has_barrier, ref_line.eigen_points.has_barrier)
+
+        self.assertEqual(line_array[1].color, "#ff0000")
+        self.assertEqual(line_array[-1].color, "#00ff00")
+
+        # Check invalid energies.
+        self.assertRaises(ValueError, ElementaryLineArray, [(0.0,)])
+
+    def test_translate(self):
+        """ Make sure all lines in array can be translated in place.
+        """
+        line_array = ElementaryLineArray([(0.0, 1.2, 0.7), (0.0, 0.8)], n=2)
+        line = line_array[1]
+
+        line_array.translate(1.0, "x").translate([0.0, 2.0], "y")
+
+        self.assertListEqual(line_array.x[:2].tolist(), [1.0, 2.0])
+        self.assertListEqual(line_array.y[6:8].tolist(), [2.0, 2.0])
+
+        # Lines are views of the buffer.
+        self.assertTupleEqual(line.eigen_points.A, (1.0, 2.0))
+
+        self.assertRaises(ValueError, line_array.translate, 1.0, "z")
+
+    def test_slice(self):
+        """ Make sure a slice of array shares the coordinate buffer.
+        """
+        line_array = ElementaryLineArray([(0.0, 1.2, 0.7), (0.0, 0.8), (0.0, 1.0, 0.5)], n=2)
+        sub_array = line_array[1:]
+
+        self.assertEqual(len(sub_array), 2)
+        self.assertListEqual(sub_array.offsets.tolist(), [0, 6, 12])
+
+        sub_array.translate(1.0, "y")
+        self.assertEqual(line_array.y[6], 1.0)
+        self.assertEqual(line_array.y[0], 0.0)
+
+    def test_expand(self):
+        """ Make sure the array can be expanded like an EPChain.
+        """
+        energies = [(0.0, 1.2, 0.7), (0.0, 0.8), (0.0, 1.0, 0.5)]
+        line_array = ElementaryLineArray(energies, n=10).expand()
+        chain = EPChain([ElementaryLine(entry, n=10) for entry in energies])
+
+        self.assertTrue(np.allclose(line_array.x, chain.x))
+        self.assertTrue(np.allclose(line_array.y, chain.y))
+
+        # Chain can be constructed from array directly.
+        chain = EPChain(ElementaryLineArray(energies, n=10))
+        self.assertTrue(np.allclose(line_array.x, chain.x))
+        self.assertTrue(np.allclose(line_array.y, chain.y))
+
+    def test_draw(self):
+        """ Make sure the array can be drawn on canvas.
+        """
+        canvas = EPCanvas()
+        line_array = ElementaryLineArray([(0.0, 1.2, 0.7), (0.0, 0.8)])
+        canvas.add_lines(line_array)
+
+        self.assertTrue(line_array in canvas)
+        self.assertRaises(ValueError, canvas.add_lines, line_array)
+
+        canvas.draw()
+        plt.close(canvas.figure)
+
+    def test_shared_chain(self):
+        """ Make sure the canvas follows a chain sharing points with the array.
+        """
+        canvas = EPCanvas(margin_ratio=1.0)
+        line_array = ElementaryLineArray([(0.0, 1.2, 0.7), (0.0, 0.8)], n=5)
+        chain = EPChain(line_array)
+        canvas.add_line_array(line_array)
+        canvas.draw()
+        self.assertTrue(np.allclose(canvas._bbox, (6.0, 0.0, 1.5, 0.0)))
+
+        version = line_array._version
+        chain.translate(10.0, "x")
+        self.assertGreater(line_array._version, version)
+        canvas.draw()
+        self.assertTrue(np.allclose(canvas._bbox, (16.0, 10.0, 1.5, 0.0)))
+
+        version = line_array._version
+        chain.elementary_lines[0].translate_state("FS", -0.2)
+        self.assertGreater(line_array._version, version)
+        canvas.draw()
+        self.assertTrue(np.allclose(canvas._bbox, (16.0, 10.0, 1.3, 0.0)))
+        plt.close(canvas.figure)
+
+    def test_shared_lines(self):
+        """ Make sure changes of lines and slices sharing points mark the array changed.
+        """
+        canvas = EPCanvas(margin_ratio=1.0)
+        line_array = ElementaryLineArray([(0.0, 1.0, 0.5), (0.0, 0.8)], n=5)
+        canvas.add_line_array(line_array)
+        canvas.draw()
+
+        line_array[0].translate(5.0, "y")
+        self.assertAlmostEqual(line_array.y.max(), 6.0)
+        canvas.draw()
+        segments = canvas.axes.collections[-1].get_segments()
+        self.assertAlmostEqual(max(segment[:, 1].max() for segment in segments), 6.0)
+        self.assertAlmostEqual(canvas._bbox[2], 6.0)
+
+        version = line_array._version
+        line_array[0].translate_state("TS", 0.2)
+        self.assertGreater(line_array._version, version)
+
+        version = line_array._version
+        line_array[1:].translate(1.0, "x")
+        self.assertGreater(line_array._version, version)
+
+        # Replaced points are no longer shared.
+        line = line_array[1]
+        line.x = line.x + 1.0
+        self.assertIsNone(line._array)
+        plt.close(canvas.figure)
+
+if "__main__" == __name__: 
+    suite = unittest.TestLoader().loadTestsFromTestCase(ElementaryLineArrayTest)
+    unittest.TextTestRunner(verbosity=2).run(suite) 
@@ -0,0 +1,265 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Test case for interpolation algorithms.
+"""
+
+import subprocess
+import sys
+import unittest
+
+import numpy as np
+
+import catplot.interpolate as interp
+from catplot.interpolate import (get_potential_energy_points, spline_interp,
+                                 batch_potential_energy_points,
+                                 quadratic_connect_coefficients,
+                                 quadratic_interp, quadratic_interp_coefficients,
+                                 hermite_interp, get_barrier_points)
+
+
+class InterpolateTest(unittest.TestCase):
+
+    def setUp(self):
+        self.maxDiff = True
+
+    def test_float_arrays(self):
+        """ Make sure the points are returned as float64 arrays.
+        """
+        for energies in [(0.0, 1.2, 0.7), (0.0, 0.8)]:
+            for kind in ["spline", "quadratic"]:
+                x, y = get_potential_energy_points(energies, n=10, kind=kind)
+                self.assertEqual(x.dtype, np.float64)
+                self.assertEqual(y.dtype, np.float64)
+                self.assertTupleEqual(y.shape, (30,))
+
+    def test_spline_vectorized(self):
+        """ Make sure the vectorized spline matches point-by-point evaluation.
+        """
+        x2, f = spline_interp(0.0, 0.0, 1.5, 0.4, 1.1)
+        x = np.linspace(0.0, 1.5, 50)
+        ref_y = np.frompyfunc(f, 1, 1)(x).astype(np.float64)
+
+        ret_x, ret_y = get_potential_energy_points((0.0, 1.1, 0.4), n=50,
+                                                   peak_width=1.5)
+        self.assertTrue(np.allclose(ret_y[50:100], ref_y, rtol=0.0, atol=1e-12))
+
+    def test_batch_points(self):
+        """ Make sure the batched points are the same with single ones.
+        """
+        hline_lengths = [1.0, 0.5, 2.0]
+        peak_widths = [1.0, 1.5, 1.0]
+
+        # Energies with barriers.
+        energies = [[0.0, 1.2, 0.7], [0.3, 0.9, -0.4], [-0.2, 1.5, 1.4]]
+        for kind in ["spline", "quadratic"]:
+            x, y = batch_potential_energy_points(energies, n=20,
+                                                 hline_lengths=hline_lengths,
+                                                 peak_widths=peak_widths,
+                                                 kind=kind)
+            self.assertTupleEqual(x.shape, (3, 60))
+            self.assertTupleEqual(y.shape, (3, 60))
+
+            for row, args in enumerate(zip(energies, hline_lengths, peak_widths)):
+                e, hl, pw = args
+                ref_x, ref_y = get_potential_energy_points(e, n=20, hline_length=hl,
+                                                           peak_width=pw, kind=kind)
+                self.assertTrue(np.allclose(x[row], ref_x, rtol=0.0, atol=1e-12))
+                self.assertTrue(np.allclose(y[row], ref_y, rtol=0.0, atol=1e-10))
+
+        # Energies without barriers.
+        energies = [[0.0, 0.8], [0.0, -0.5], [0.2, 0.2]]
+        x, y = batch_potential_energy_points(energies, n=20, peak_widths=peak_widths)
+        for row, (e, pw) in enumerate(zip(energies, peak_widths)):
+            ref_x, ref_y = get_potential_energy_points(e, n=20, peak_width=pw)
+            self.assertTrue(np.allclose(x[row], ref_x, rtol=0.0, atol=1e-12))
+            self.assertTrue(np.allclose(y[row], ref_y, rtol=0.0, atol=1e-10))
+
+        # Check abnormal energies and invalid shape.
+        self.assertRaises(ValueError, batch_potential_energy_points,
+                          [[0.0, 1.2, 0.7], [0.0, 0.5, 0.7]])
+        self.assertRaises(ValueError, batch_potential_energy_points, [0.0, 1.2, 0.7])
+
+    def test_quadratic_connect_coefficients(self):
+        """ Make sure the closed-form coefficients solve the linear equations.
+        """
+        x1 = np.array([0.0, 2.0, -1.0])
+        y1 = np.array([0.0, 0.7, 0.3])
+        x2 = np.array([0.5, 0.6, 1.0])
+        y2 = np.array([1.2, 1.0, -0.2])
+
+        a, b, c = quadratic_connect_coefficients(x1, y1, x2, y2)
+
+        for row in range(3):
+            A = np.array([[x1[row]**2, x1[row], 1.0],
+                          [x2[row]**2, x2[row], 1.0],
+                          [2*x2[row], 1.0, 0.0]])
+            ref = np.linalg.solve(A, [y1[row], y2[row], 0.0])
+            self.assertTrue(np.allclose([a[row], b[row], c[row]], ref))
+
+    def test_quadratic_interp_coefficients(self):
+        """ Make sure the vectorized quadratic interpolation is correct.
+        """
+        y1 = np.array([0.0, 0.3, 0.0, -0.2])
+        y2 = np.array([1.2, 1.1, 0.5, 1.0])
+        y3 = np.array([0.7, -0.4, 0.7, -0.2])
+
+        x2, m, valid = quadratic_interp_coefficients(0.0, y1, 1.0, y3, y2)
+        self.assertListEqual(valid.tolist(), [True, True, False, True])
+        self.assertTrue(np.isnan(x2[2]))
+
+        for row in [0, 1, 3]:
+            ref_x2, f = quadratic_interp(0.0, y1[row], 1.0, y3[row], y2[row])
+            self.assertAlmostEqual(x2[row], ref_x2)
+            self.assertAlmostEqual(m[row]*(0.3 - x2[row])**2 + y2[row], f(0.3))
+
+        # Scalar version still raises.
+        self.assertRaises(ValueError, quadratic_interp, 0.0, 0.0, 1.0, 0.7, 0.5)
+
+    def test_batch_mask(self):
+        """ Make sure the invalid rows can be masked in batch.
+        """
+        energies = [[0.0, 1.2, 0.7], [0.0, 0.5, 0.7], [0.0, 1.0, -0.3]]
+        for kind in ["spline", "quadratic"]:
+            self.assertRaises(ValueError, batch_potential_energy_points,
+                              energies, n=10, kind=kind)
+
+            x, y = batch_potential_energy_points(energies, n=10, kind=kind, errors="mask")
+            self.assertListEqual(np.isnan(y).any(axis=1).tolist(), [False, True, False])
+            self.assertFalse(np.isnan(x).any())
+
+    def test_hermite_interp(self):
+        """ Make sure the Hermite barrier passes points monotonically.
+        """
+        x2, f = hermite_interp(0.0, 0.0, 1.0, 0.7, 1.2)
+        self.assertEqual(x2, 0.5)
+        self.assertListEqual(f(np.array([0.0, 0.5, 1.0])).tolist(), [0.0, 1.2, 0.7])
+
+        x = np.linspace(0.0, 1.0, 101)
+        y = f(x)
+        self.assertTrue(np.all(np.diff(y[:51]) >= 0.0))
+        self.assertTrue(np.all(np.diff(y[50:]) <= 0.0))
+
+        # The batch and template are available for Hermite kind.
+        for energies in [(0.0, 1.2, 0.7), (0.0, 0.8), (0.0, -0.5)]:
+            ref_x, ref_y = get_potential_energy_points(energies, n=20, kind="hermite")
+            x, y = get_potential_energy_points(energies, n=20, kind="hermite",
+                                               template=True)
+            self.assertTrue(np.allclose(y, ref_y, rtol=0.0, atol=1e-12))
+            x, y = batch_potential_energy_points([energies], n=20, kind="hermite")
+            self.assertTrue(np.allclose(y[0], ref_y, rtol=0.0, atol=1e-12))
+
+    def test_lazy_scipy_import(self):
+        """ Make sure SciPy is not imported for Hermite interpolation.
+        """
+        code = ("import sys\n"
+                "from catplot.interpolate import get_potential_energy_points\n"
+                "get_potential_energy_points((0.0, 1.2, 0.7), kind='hermite')\n"
+                "get_potential_energy_points((0.0, 0.7), kind='hermite')\n"
+                "assert 'scipy' not in sys.modules\n")
+        self.assertEqual(subprocess.call([sys.executable, "-c", code]), 0)
+
+    def test_adaptive_sampling(self):
+        """ Make sure the adaptive sampling keeps the curve within tolerance.
+        """
+        for energies in [(0.0, 1.2, 0.7), (0.0, 3.0, -2.0), (0.0, 0.8)]:
+            x, y = get_potential_energy_points(energies, n=100, sampling="adaptive",
+                                               tolerance=1e-3)
+            ref_x, ref_y = get_potential_energy_points(energies, n=1000)
+
+            # Only end points for IS and FS.
+            self.assertListEqual(x[:2].tolist(), [0.0, 1.0])
+            self.assertListEqual(x[-2:].tolist(), [2.0, 3.0])
+            self.assertLess(len(x), 100)
+
+            self.assertLess(np.max(np.abs(np.interp(ref_x, x, y) - ref_y)), 1e-3)
+
+        # At most n points on the barrier.
+        for kind in ["spline", "hermite"]:
+            for n in [3, 10, 100]:
+                x, y = get_barrier_points((0.0, 3.0, -2.0), n=n, kind=kind,
+                                          sampling="adaptive", tolerance=1e-6)
+                self.assertLessEqual(len(x), n)
+                self.assertListEqual([x[0], x[-1]], [0.0, 1.0])
+
+        self.assertRaises(ValueError, get_potential_energy_points, (0.0, 1.2, 0.7),
+                          sampling="abc")
+
+    def test_barrier_templates(self):
+        """ Make sure the barriers from templates are the same with fitted ones.
+        """
+        interp.clear_barrier_templates()
+        interp.precompute_barrier_templates([1.0, 1.5], n=50)
+
+        for energies in [(0.0, 1.2, 0.7), (0.3, 2.0, -1.0), (0.0, 0.8), (0.0, -0.5)]:
+            for peak_width in [1.0, 1.5]:
+                x, y = get_potential_energy_points(energies, n=50, peak_width=peak_width,
+                                                   template=True)
+                ref_x, ref_y = get_potential_energy_points(energies, n=50,
+                                                           peak_width=peak_width)
+                self.assertTrue(np.allclose(x, ref_x, rtol=0.0, atol=1e-12))
+                self.assertTrue(np.allclose(y, ref_y, rtol=0.0, atol=1e-10))
+
+        # All templates are precomputed.
+        self.assertEqual(interp._template_cache.misses, 6)
+
+        template = interp.barrier_template(1.0, 50)
+        self.assertTupleEqual(template.shape, (50, 3))
+        self.assertFalse(template.flags.writeable)
+
+        self.assertRaises(ValueError, get_potential_energy_points, (0.0, 1.2, 0.7),
+                          kind="quadratic", template=True)
+        self.assertRaises(ValueError, get_potential_energy_points, (0.0, 1.2, 0.7),
+                          sampling="adaptive", template=True)
+
+    def test_batch_rare_widths(self):
+        """ Make sure rows of rare peak widths are interpolated without templates.
+        """
+        interp.clear_barrier_templates()
+        energies = [(0.0, 1.2, 0.7), (0.3, 2.0, -1.0), (0.0, 0.8, 0.5), (0.0, 0.9, 0.1)]
+        peak_widths = [0.5, 0.6, 1.0, 1.0]
+        x, y = batch_potential_energy_points(energies, n=50, peak_widths=peak_widths)
+
+        for row, (e, peak_width) in enumerate(zip(energies, peak_widths)):
+            ref_x, ref_y = get_potential_energy_points(e, n=50, peak_width=peak_width)
+            self.assertTrue(np.allclose(x[row], ref_x, rtol=0.0, atol=1e-12))
+            self.assertTrue(np.allclose(y[row], ref_y, rtol=0.0, atol=1e-10))
+
+        self.assertEqual(len(interp._template_cache), 0)
+
+        # Shared widths use templates.
+        batch_potential_energy_points(energies[:3], n=50)
+        self.assertEqual(len(interp._template_cache), 1)
+
+    def test_profile_cache(self):
+        """ Make sure the profiles can be cached and evicted correctly.
+        """
+        self.assertIsNone(interp.profile_cache_info())
+
+        interp.enable_profile_cache(maxsize=2)
+        try:
+            x1, y1 = get_potential_energy_points((0.0, 1.2, 0.7), n=10)
+            x2, y2 = get_potential_energy_points((0.0, 1.2, 0.7), n=10)
+
+            self.assertListEqual(y1.tolist(), y2.tolist())
+            self.assertTupleEqual(tuple(interp.profile_cache_info()), (1, 1, 2, 1))
+
+            # Returned arrays must not share the memory with cache.
+            x1 += 1.0
+            x3, _ = get_potential_energy_points((0.0, 1.2, 0.7), n=10)
+            self.assertListEqual(x3.tolist(), x2.tolist())
+
+            # Least recently used profile is evicted.
+            get_potential_energy_points((0.0, 1.0, 0.7), n=10)
+            get_potential_energy_points((0.0, 0.8), n=10)
+            get_potential_energy_points((0.0, 1.2, 0.7), n=10)
+            self.assertTupleEqual(tuple(interp.profile_cache_info()), (2, 4, 2, 2))
+
+            interp.clear_profile_cache()
+            self.assertTupleEqual(tuple(interp.profile_cache_info()), (0, 0, 2, 0))
+        finally:
+            interp.disable_profile_cache()
+
+if "__main__" == __name__:
+    suite = unittest.TestLoader().loadTestsFromTestCase(InterpolateTest)
+    unittest.TextTestRunner(verbosity=2).run(suite)
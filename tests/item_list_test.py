@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Test case for ItemList.
+"""
+
+import copy
+import pickle
+import unittest
+
+from catplot.ep_components.item_list import ItemList
+
+
+class Item(object):
+    pass
+
+
+class ItemListTest(unittest.TestCase):
+
+    def setUp(self):
+        self.maxDiff = True
+
+    def test_positions(self):
+        """ Make sure the positions follow the list changed in place.
+        """
+        changes = []
+        a, b, c = Item(), Item(), Item()
+        items = ItemList([a, b], on_change=lambda: changes.append(len(items)))
+
+        self.assertDictEqual(items.positions, {id(a): 0, id(b): 1})
+        self.assertEqual(items.position(b), 1)
+        self.assertIsNone(items.position(c))
+        self.assertFalse(c in items)
+
+        # Adding items does not call the callback.
+        items.add([c])
+        self.assertEqual(items.position(c), 2)
+        self.assertListEqual(changes, [])
+
+        items.remove(a)
+        self.assertIsNone(items.position(a))
+        self.assertEqual(items.position(c), 1)
+
+        items.insert(0, a)
+        items[1:2] = []
+        del items[-1]
+        items += [b]
+        self.assertListEqual(items, [a, b])
+        self.assertDictEqual(items.positions, {id(a): 0, id(b): 1})
+        self.assertListEqual(changes, [2, 3, 2, 1, 2])
+
+    def test_copy(self):
+        """ Make sure a copied list indexes its own items.
+        """
+        items = ItemList([Item(), Item()])
+        new_items = copy.deepcopy(items)
+        self.assertEqual(new_items.position(new_items[1]), 1)
+        self.assertIsNone(new_items.position(items[0]))
+
+        new_items = pickle.loads(pickle.dumps(items))
+        self.assertEqual(new_items.position(new_items[1]), 1)
+
+if "__main__" == __name__:
+    suite = unittest.TestLoader().loadTestsFromTestCase(ItemListTest)
+    unittest.TextTestRunner(verbosity=2).run(suite)